@@ -13,13 +13,50 @@ Usage:
 """
 
 import argparse
-import json
 import re
-from collections import Counter, defaultdict
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from heapq import nlargest
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
 from statistics import mean, median
 
-from utils import bar, fmt_int, pct
+from utils import bar, dump_json, fmt_int, load_json, pct
+
+
+# Compiled once at import — infer_content_type runs per page, and per-call
+# re.search/re.match would re-do the pattern-cache lookup every time.
+_RFC_RE = re.compile(r"\bRFC\b")
+_DD_RE = re.compile(r"DD\s*[-–]")
+_DESIGN_RE = re.compile(r"design\s+doc", re.IGNORECASE)
+_IMPL_RE = re.compile(r"\bimplement", re.IGNORECASE)
+_DIAG_RE = re.compile(r"\bflowchart\b|\bdiagram\b", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class Page:
+    """Compact per-page record — slotted attribute access is faster and
+    leaner than repeated dict lookups in the aggregation loop."""
+
+    title: str
+    space: str
+    created: str
+    last_modified: str
+    version_number: int | None
+    sort_date: str = ""
+
+
+def _page(raw: dict) -> Page:
+    return Page(
+        title=raw.get("title") or "",
+        space=raw.get("space") or "",
+        created=raw.get("created") or "",
+        last_modified=raw.get("last_modified") or "",
+        version_number=raw.get("version_number"),
+    )
 
 
 def space_label(key: str) -> tuple[str, str]:
@@ -28,14 +65,20 @@ def space_label(key: str) -> tuple[str, str]:
     return key, "team"
 
 
+@lru_cache(maxsize=4096)
 def infer_content_type(title: str, space: str) -> str:
-    if space.upper() == "RFC" or re.search(r"\bRFC\b", title):
+    # C-level substring checks on one lowercase copy gate the regexes, so a
+    # regex (which still enforces word boundaries and case) only runs when
+    # its marker text occurs in the title at all — most titles never reach
+    # the regex engine.
+    t = title.lower()
+    if space.upper() == "RFC" or ("rfc" in t and _RFC_RE.search(title)):
         return "RFC"
-    if re.match(r"DD\s*[-–]", title) or re.search(r"design\s+doc", title, re.IGNORECASE):
+    if _DD_RE.match(title) or ("design" in t and _DESIGN_RE.search(title)):
         return "Design Doc"
-    if re.search(r"\bimplement", title, re.IGNORECASE):
+    if "implement" in t and _IMPL_RE.search(title):
         return "Implementation"
-    if re.search(r"\bflowchart\b|\bdiagram\b", title, re.IGNORECASE):
+    if ("flowchart" in t or "diagram" in t) and _DIAG_RE.search(title):
         return "Flowchart / Diagram"
     return "Other"
 
@@ -47,147 +90,207 @@ def ym(date_str: str) -> str:
 # ── display ───────────────────────────────────────────────────────────────────
 
 
-def _section(heading: str, fill: int = 53) -> None:
+def _section(heading: str, fill: int = 53) -> str:
     pad = fill - len(heading) - 3
-    print(f"\n── {heading} {'─' * max(pad, 2)}")
-
-
-def display(author: str, data: dict) -> None:
-    created = data.get("created", [])
-    contributed = data.get("contributed", [])
-    all_pages = created + contributed
-    total = len(all_pages)
-    since = data.get("since", "")
-
-    print(f"\n{'═' * 55}")
-    print(f"  Confluence Analysis — {author}")
+    return f"\n── {heading} {'─' * max(pad, 2)}"
+
+
+def aggregate(data: dict) -> dict:
+    """One fused pass over all pages producing every per-page aggregate.
+
+    All counters are filled in a single walk over the data instead of one
+    traversal per display section; `is_created` keeps the created/edited
+    split. Both display() and the --output JSON writer consume the result,
+    so the work happens exactly once per run.
+    """
+    created = [_page(p) for p in data.get("created", [])]
+    contributed = [_page(p) for p in data.get("contributed", [])]
+
+    # Keys are collected into plain lists and counted in one Counter() call
+    # afterwards — Counter's C counting path is faster on a list than
+    # per-item `counter[k] += 1` updates.
+    space_keys: list[str] = []
+    team_spaces: set[str] = set()
+    has_personal = False
+    type_keys: list[str] = []
+    m_created: Counter = Counter()
+    m_edited: Counter = Counter()
+    max_activity = 0
+    versions: list[tuple[int, str, str]] = []
+
+    tagged = chain(((True, p) for p in created), ((False, p) for p in contributed))
+    for is_created, p in tagged:
+        title = p.title
+        space = p.space
+        created_date = p.created
+        last_mod = p.last_modified
+        vnum = p.version_number
+
+        label, _ = space_label(space)
+        space_keys.append(label)
+        if space.startswith("~"):
+            has_personal = True
+        else:
+            team_spaces.add(space)
+
+        type_keys.append(infer_content_type(title, space))
+
+        if is_created:
+            m = ym(created_date)
+            if m:
+                m_created[m] += 1
+                activity = m_created[m] + m_edited[m]
+                if activity > max_activity:
+                    max_activity = activity
+            if vnum is not None:
+                versions.append((vnum, title, last_mod))
+            # Normalized sort key so _print_page_list can use a C-level
+            # attrgetter instead of a per-comparison lambda.
+            p.sort_date = created_date
+        else:
+            m = ym(last_mod or created_date)
+            if m:
+                m_edited[m] += 1
+                activity = m_created[m] + m_edited[m]
+                if activity > max_activity:
+                    max_activity = activity
+            p.sort_date = last_mod
+
+    return {
+        "created": created,
+        "contributed": contributed,
+        "total": len(created) + len(contributed),
+        "since": data.get("since", ""),
+        "space_counts": Counter(space_keys),
+        "type_counts": Counter(type_keys),
+        "unique_spaces": len(team_spaces) + (1 if has_personal else 0),
+        "m_created": m_created,
+        "m_edited": m_edited,
+        "max_activity": max_activity,
+        "versions": versions,
+    }
+
+
+def display(author: str, agg: dict) -> None:
+    created = agg["created"]
+    contributed = agg["contributed"]
+    total = agg["total"]
+    since = agg["since"]
+    space_counts = agg["space_counts"]
+    type_counts = agg["type_counts"]
+    unique_spaces = agg["unique_spaces"]
+    m_created = agg["m_created"]
+    m_edited = agg["m_edited"]
+    versions = agg["versions"]
+
+    # Lines are buffered and flushed in a single stdout write at the end —
+    # one syscall instead of one per print().
+    out: list[str] = []
+
+    out.append(f"\n{'═' * 55}")
+    out.append(f"  Confluence Analysis — {author}")
     if since:
-        print(f"  (since {since})")
-    print(f"{'═' * 55}")
+        out.append(f"  (since {since})")
+    out.append(f"{'═' * 55}")
 
     # ── Summary ───────────────────────────────────────────────
-    _section("Summary")
-    print(f"  Pages created by you    {fmt_int(len(created)):>5}")
-    print(f"  Pages edited by you     {fmt_int(len(contributed)):>5}   (others' pages)")
-    print(f"  Total pages touched     {fmt_int(total):>5}")
+    out.append(_section("Summary"))
+    out.append(f"  Pages created by you    {fmt_int(len(created)):>5}")
+    out.append(f"  Pages edited by you     {fmt_int(len(contributed)):>5}   (others' pages)")
+    out.append(f"  Total pages touched     {fmt_int(total):>5}")
 
     # ── By Space ──────────────────────────────────────────────
-    space_counts: Counter = Counter()
-    for p in all_pages:
-        label, _ = space_label(p.get("space", ""))
-        space_counts[label] += 1
-
-    unique_spaces = len({
-        p.get("space", "") for p in all_pages if not p.get("space", "").startswith("~")
-    }) + (1 if any(p.get("space", "").startswith("~") for p in all_pages) else 0)
-
-    _section(f"By Space  ({unique_spaces} spaces)")
+    out.append(_section(f"By Space  ({unique_spaces} spaces)"))
     for sp, n in space_counts.most_common():
         kind = "personal" if sp == "Personal" else "team"
         b = bar(n / total)
-        print(f"  {sp:<12} ({kind:<8})  {n:>3}  {pct(n, total):>4}  {b}")
+        out.append(f"  {sp:<12} ({kind:<8})  {n:>3}  {pct(n, total):>4}  {b}")
 
     # ── By Content Type ────────────────────────────────────────
-    type_counts: Counter = Counter(
-        infer_content_type(p.get("title", ""), p.get("space", "")) for p in all_pages
-    )
-    _section("By Content Type")
+    out.append(_section("By Content Type"))
     for ctype, n in type_counts.most_common():
         b = bar(n / total)
-        print(f"  {ctype:<22}  {n:>3}  {pct(n, total):>4}  {b}")
+        out.append(f"  {ctype:<22}  {n:>3}  {pct(n, total):>4}  {b}")
 
     # ── Activity Timeline ──────────────────────────────────────
-    monthly: dict[str, dict[str, int]] = defaultdict(lambda: {"created": 0, "edited": 0})
-    for p in created:
-        m = ym(p.get("created", ""))
-        if m:
-            monthly[m]["created"] += 1
-    for p in contributed:
-        m = ym(p.get("last_modified", "") or p.get("created", ""))
-        if m:
-            monthly[m]["edited"] += 1
-
-    if monthly:
-        _section("Activity Timeline")
-        max_activity = max(v["created"] + v["edited"] for v in monthly.values())
-        print(f"  {'month':<10}  {'created':>7}  {'edited':>6}   activity")
-        print(f"  {'─' * 10}  {'─' * 7}  {'─' * 6}   {'─' * 20}")
-        for month in sorted(monthly):
-            v = monthly[month]
-            total_month = v["created"] + v["edited"]
+    months = set(m_created) | set(m_edited)
+    if months:
+        out.append(_section("Activity Timeline"))
+        max_activity = agg["max_activity"]
+        out.append(f"  {'month':<10}  {'created':>7}  {'edited':>6}   activity")
+        out.append(f"  {'─' * 10}  {'─' * 7}  {'─' * 6}   {'─' * 20}")
+        for month in sorted(months):
+            n_created, n_edited = m_created[month], m_edited[month]
+            total_month = n_created + n_edited
             b = bar(total_month / max_activity if max_activity else 0)
-            print(f"  {month:<10}  {v['created']:>7}  {v['edited']:>6}   {b}  {total_month}")
+            out.append(f"  {month:<10}  {n_created:>7}  {n_edited:>6}   {b}  {total_month}")
 
     # ── Created Page Versions ──────────────────────────────────
-    versions = [
-        (p.get("version_number") or 0, p.get("title", ""), p.get("last_modified", ""))
-        for p in created
-        if p.get("version_number") is not None
-    ]
     if versions:
         v_nums = [v for v, _, _ in versions]
-        _section("Created Page Versions")
-        print(f"  Mean versions/page     {mean(v_nums):.1f}")
-        print(f"  Median                 {median(v_nums):.1f}")
-        print(f"  Max                    {max(v_nums)}")
+        out.append(_section("Created Page Versions"))
+        out.append(f"  Mean versions/page     {mean(v_nums):.1f}")
+        out.append(f"  Median                 {median(v_nums):.1f}")
+        out.append(f"  Max                    {max(v_nums)}")
         drafts = sum(1 for v in v_nums if v <= 2)
         if drafts:
-            print(f"  Still at v1-2 (draft)  {drafts}")
-        print()
-        print(f"  {'v':>3}  {'last modified':<13}  title")
-        print(f"  {'─' * 3}  {'─' * 13}  {'─' * 55}")
-        sorted_versions = sorted(versions, reverse=True)
-        for v_num, title, last_mod in sorted_versions[:_PAGE_LIST_LIMIT]:
+            out.append(f"  Still at v1-2 (draft)  {drafts}")
+        out.append("")
+        out.append(f"  {'v':>3}  {'last modified':<13}  title")
+        out.append(f"  {'─' * 3}  {'─' * 13}  {'─' * 55}")
+        # Only the top N rows are shown — nlargest is O(n log k), not a full
+        # sort, and keeps the same tie order as sorted(reverse=True).
+        for v_num, title, last_mod in nlargest(_PAGE_LIST_LIMIT, versions):
             short = title[:55] + "..." if len(title) > 55 else title
-            print(f"  {v_num:>3}  {last_mod:<13}  {short}")
-        if len(sorted_versions) > _PAGE_LIST_LIMIT:
-            print(f"  … and {len(sorted_versions) - _PAGE_LIST_LIMIT} more")
+            out.append(f"  {v_num:>3}  {last_mod:<13}  {short}")
+        if len(versions) > _PAGE_LIST_LIMIT:
+            out.append(f"  … and {len(versions) - _PAGE_LIST_LIMIT} more")
 
     # ── Page Lists ────────────────────────────────────────────
-    _print_page_list("Pages Created", created, show_version=True)
-    _print_page_list("Pages Edited (not created by you)", contributed, show_version=False)
+    _print_page_list(out, "Pages Created", created, show_version=True)
+    _print_page_list(out, "Pages Edited (not created by you)", contributed, show_version=False)
 
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 _PAGE_LIST_LIMIT = 20
 
 
-def _print_page_list(heading: str, pages: list[dict], show_version: bool = False) -> None:
+def _print_page_list(out: list[str], heading: str, pages: list[Page], show_version: bool = False) -> None:
     n = len(pages)
     fill = 53 - len(heading) - 2
-    print(f"\n── {heading} {'─' * max(fill, 2)}  {n} pages")
+    out.append(f"\n── {heading} {'─' * max(fill, 2)}  {n} pages")
     if not pages:
-        print("  (none)")
+        out.append("  (none)")
         return
 
     if show_version:
-        print(f"  {'space':<8}  {'v':>3}  {'title':<58}  {'date'}")
-        print(f"  {'─' * 8}  {'─' * 3}  {'─' * 58}  {'─' * 10}")
+        out.append(f"  {'space':<8}  {'v':>3}  {'title':<58}  {'date'}")
+        out.append(f"  {'─' * 8}  {'─' * 3}  {'─' * 58}  {'─' * 10}")
     else:
-        print(f"  {'space':<8}  {'title':<60}  {'date'}")
-        print(f"  {'─' * 8}  {'─' * 60}  {'─' * 10}")
+        out.append(f"  {'space':<8}  {'title':<60}  {'date'}")
+        out.append(f"  {'─' * 8}  {'─' * 60}  {'─' * 10}")
 
-    sort_field = "created" if show_version else "last_modified"
-    sorted_pages = sorted(pages, key=lambda x: x.get(sort_field) or "", reverse=True)
-    for p in sorted_pages[:_PAGE_LIST_LIMIT]:
-        space = (p.get("space") or "")[:8]
-        title = p.get("title") or ""
-        date = (p.get("created") or "")[:10]
+    # Bounded display: a k-sized heap beats fully sorting the page list
+    for p in nlargest(_PAGE_LIST_LIMIT, pages, key=attrgetter("sort_date")):
+        space = p.space[:8]
+        title = p.title
+        date = p.created[:10]
 
         if show_version:
-            v = p.get("version_number") or ""
+            v = p.version_number or ""
             if len(title) > 58:
                 title = title[:55] + "..."
-            print(f"  {space:<8}  {v!s:>3}  {title:<58}  {date}")
+            out.append(f"  {space:<8}  {v!s:>3}  {title:<58}  {date}")
         else:
-            last_mod = (p.get("last_modified") or date)[:10]
+            last_mod = (p.last_modified or date)[:10]
             if len(title) > 60:
                 title = title[:57] + "..."
-            print(f"  {space:<8}  {title:<60}  {last_mod}")
+            out.append(f"  {space:<8}  {title:<60}  {last_mod}")
 
     if n > _PAGE_LIST_LIMIT:
-        print(f"  … and {n - _PAGE_LIST_LIMIT} more")
+        out.append(f"  … and {n - _PAGE_LIST_LIMIT} more")
 
 
 # ── main ──────────────────────────────────────────────────────────────────────
@@ -212,39 +315,31 @@ def main():
     if not input_path.exists():
         raise SystemExit(f"Input file not found: {input_path}")
 
-    data = json.loads(input_path.read_text())
+    data = load_json(input_path)
 
     if not author:
         author = input_path.stem.removesuffix("_confluence") or "unknown"
 
-    display(author, data)
+    agg = aggregate(data)
+    display(author, agg)
 
     if args.output:
-        created = data.get("created", [])
-        contributed = data.get("contributed", [])
-        type_counts = Counter(
-            infer_content_type(p.get("title", ""), p.get("space", ""))
-            for p in created + contributed
-        )
-        space_counts: Counter = Counter()
-        for p in created + contributed:
-            label, _ = space_label(p.get("space", ""))
-            space_counts[label] += 1
-        v_nums = [p.get("version_number") for p in created if p.get("version_number") is not None]
+        # Reuse the aggregates display() just consumed — no recomputation
+        v_nums = [v for v, _, _ in agg["versions"]]
         stats = {
             "author": author,
-            "since": data.get("since", ""),
-            "pages_created": len(created),
-            "pages_edited": len(contributed),
-            "total_pages_touched": len(created) + len(contributed),
-            "by_space": dict(space_counts.most_common()),
-            "by_content_type": dict(type_counts.most_common()),
+            "since": agg["since"],
+            "pages_created": len(agg["created"]),
+            "pages_edited": len(agg["contributed"]),
+            "total_pages_touched": agg["total"],
+            "by_space": dict(agg["space_counts"].most_common()),
+            "by_content_type": dict(agg["type_counts"].most_common()),
             "version_mean": round(mean(v_nums), 1) if v_nums else None,
             "version_max": max(v_nums) if v_nums else None,
         }
         out = Path(args.output)
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(json.dumps(stats, indent=2))
+        dump_json(out, stats)
         print(f"Stats written to: {args.output}")
 
 
@@ -14,122 +14,171 @@ Usage:
 
 import argparse
 import csv
-import json
 import sys
 from collections import Counter
-from datetime import datetime, timezone
+from datetime import datetime, time as dtime, timezone
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from statistics import mean, median
 
-from utils import fmt_duration, fmt_int, pct
+from utils import dump_json, fmt_duration, fmt_int, load_json, pct
+
+try:
+    # Optional: numpy's C reductions beat statistics.mean/median once the
+    # value lists get large. The script works fine without it.
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this size the statistics module wins (no array-construction overhead)
+_NUMPY_MIN_SIZE = 256
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
 
+def _mean_median(values: list) -> tuple[float, float]:
+    """Mean and median, vectorized with numpy when it pays off."""
+    if np is not None and len(values) >= _NUMPY_MIN_SIZE:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        return float(arr.mean()), float(np.median(arr))
+    return mean(values), median(values)
+
+
+@lru_cache(maxsize=8192)
 def parse_dt(s: str | None) -> datetime | None:
-    if not s or not s.strip():
+    if not s:
+        return None
+    s = s.strip()
+    if not s:
+        return None
+    # Dispatch on cheap character checks instead of trial-and-error strptime:
+    # "/" → JIRA CSV format, "T" → full ISO timestamp, else bare ISO date.
+    # fromisoformat is C-implemented and much faster than strptime.
+    try:
+        if "/" in s:
+            return datetime.strptime(s, "%d/%b/%y %I:%M %p").replace(tzinfo=timezone.utc)
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except ValueError:
         return None
-    for fmt in ("%d/%b/%y %I:%M %p", "%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%d"):
-        try:
-            dt = datetime.strptime(s.strip(), fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except ValueError:
-            continue
-    return None
 
 
 def days_between(a: str | None, b: str | None) -> float | None:
     dt_a, dt_b = parse_dt(a), parse_dt(b)
     if dt_a and dt_b:
-        return abs((dt_b - dt_a).total_seconds()) / 86400
+        # Date-only fields (midnight timestamps) reduce to an integer day
+        # subtraction, skipping the timedelta float conversion.
+        if dt_a.time() == dtime.min and dt_b.time() == dtime.min:
+            return float(abs((dt_b.date() - dt_a.date()).days))
+        return abs((dt_b - dt_a).total_seconds()) * (1.0 / 86400)
     return None
 
 
-def all_sprints(row: dict) -> list[str]:
-    """Return all non-empty sprint values for a ticket."""
-    sprints = []
-    for col in ("Sprint", "Sprint_2", "Sprint_3"):
-        val = row.get(col, "").strip()
-        if val:
-            sprints.append(val)
-    return sprints
-
-
-def story_points(row: dict) -> int | None:
-    raw = row.get("Custom field (Story Points)", "").strip()
-    if not raw:
-        return None
-    try:
-        return int(float(raw))
-    except ValueError:
-        return None
+def csv_columns(header: list[str]) -> dict[str, int]:
+    """Map header names to column indices for raw csv.reader rows."""
+    return {name: i for i, name in enumerate(header)}
 
 
 # ── core analysis ─────────────────────────────────────────────────────────────
 
 
-def analyse_jira(rows: list[dict], jira_name: str) -> dict:
-    total = len(rows)
-
-    # Assigned / reported counts — top-level only, uses full dataset
-    assigned_rows = [r for r in rows if r.get("Assignee", "").strip() == jira_name]
-    reported = sum(1 for r in rows if r.get("Reporter", "").strip() == jira_name)
-    both = sum(
-        1
-        for r in rows
-        if r.get("Assignee", "").strip() == jira_name
-        and r.get("Reporter", "").strip() == jira_name
+def analyse_jira(rows, col: dict[str, int], jira_name: str) -> dict:
+    """Compute all JIRA stats in one pass over raw csv.reader rows.
+
+    `col` maps header names to column indices (see csv_columns); raw list rows
+    avoid the per-row dict that DictReader would build for every ticket.
+    """
+    i_assignee = col.get("Assignee", -1)
+    i_reporter = col.get("Reporter", -1)
+    i_type = col.get("Issue Type", -1)
+    i_priority = col.get("Priority", -1)
+    i_project = col.get("Project key", -1)
+    i_sp = col.get("Custom field (Story Points)", -1)
+    i_created = col.get("Created", -1)
+    i_resolved = col.get("Resolved", -1)
+    i_parent = col.get("Parent summary", -1)
+    sprint_cols = tuple(
+        i for name in ("Sprint", "Sprint_2", "Sprint_3") if (i := col.get(name, -1)) >= 0
     )
-    assigned = len(assigned_rows)
+    n_cols = len(col)
 
-    # ── Everything below is scoped to assigned_rows ──────────────────────────
+    total = assigned = reported = both = bugs = 0
 
-    # Ticket type / priority / project breakdowns
-    by_type = Counter(
-        r.get("Issue Type", "").strip() or "Unknown" for r in assigned_rows
-    )
-    by_priority = Counter(
-        r.get("Priority", "").strip() or "Unknown" for r in assigned_rows
-    )
-    by_project = Counter(
-        r.get("Project key", "").strip() or "Unknown" for r in assigned_rows
-    )
+    # Breakdown keys are appended to lists and counted in one Counter() call
+    # after the loop — Counter's C counting path beats per-item increments.
+    type_keys: list[str] = []
+    priority_keys: list[str] = []
+    project_keys: list[str] = []
+    parent_keys: list[str] = []
+    sprint_tickets: Counter = Counter()
+    sprint_sp: dict[str, int] = {}
+    sp_values: list[int] = []
+    cycle_times: list[float] = []
+
+    for r in rows:
+        if len(r) < n_cols:  # guard against ragged rows
+            r = r + [""] * (n_cols - len(r))
+        total += 1
+        is_assigned = i_assignee >= 0 and r[i_assignee].strip() == jira_name
+        is_reporter = i_reporter >= 0 and r[i_reporter].strip() == jira_name
+        reported += is_reporter
+        if not is_assigned:
+            continue
+        assigned += 1
+        both += is_reporter
+
+        # ── Everything below is scoped to assigned tickets ───────────────────
+        # Type/priority/project/sprint have very low cardinality, so the keys
+        # are interned: every repeat becomes the same object and the Counter /
+        # dict lookups below compare pointers instead of full strings.
+        issue_type = r[i_type].strip() if i_type >= 0 else ""
+        type_keys.append(sys.intern(issue_type or "Unknown"))
+        priority_keys.append(sys.intern((r[i_priority].strip() if i_priority >= 0 else "") or "Unknown"))
+        project_keys.append(sys.intern((r[i_project].strip() if i_project >= 0 else "") or "Unknown"))
+        bugs += issue_type.lower() == "bug"
+
+        # Story points, parsed inline once per row and reused below
+        raw_sp = r[i_sp].strip() if i_sp >= 0 else ""
+        sp: int | None = None
+        if raw_sp:
+            try:
+                sp = int(float(raw_sp))
+            except ValueError:
+                pass
+        if sp is not None:
+            sp_values.append(sp)
+
+        d = days_between(
+            r[i_created] if i_created >= 0 else None,
+            r[i_resolved] if i_resolved >= 0 else None,
+        )
+        if d is not None:
+            cycle_times.append(d)
 
-    # Bug rate
-    bugs = sum(
-        1 for r in assigned_rows if r.get("Issue Type", "").strip().lower() == "bug"
-    )
+        parent_keys.append((r[i_parent].strip() if i_parent >= 0 else "") or "— (no epic)")
 
-    # Story points
-    sp_values = [sp for r in assigned_rows if (sp := story_points(r)) is not None]
-    sp_total = sum(sp_values)
-    sp_missing = assigned - len(sp_values)
+        for i in sprint_cols:
+            s = r[i].strip()
+            if s:
+                s = sys.intern(s)
+                sprint_tickets[s] += 1
+                sprint_sp[s] = sprint_sp.get(s, 0) + (sp or 0)
 
-    # Cycle time: Created → Resolved
-    cycle_times = [
-        d
-        for r in assigned_rows
-        if (d := days_between(r.get("Created"), r.get("Resolved"))) is not None
-    ]
+    by_type = Counter(type_keys)
+    by_priority = Counter(priority_keys)
+    by_project = Counter(project_keys)
+    parent_counts = Counter(parent_keys)
 
-    # Epic / initiative breakdown via Parent summary
-    parent_counts: Counter = Counter()
-    for r in assigned_rows:
-        parent = r.get("Parent summary", "").strip() or "— (no epic)"
-        parent_counts[parent] += 1
+    sp_total = sum(sp_values)
+    sp_missing = assigned - len(sp_values)
+    sp_mean, sp_median = _mean_median(sp_values) if sp_values else (None, None)
+    ct_mean, ct_median = _mean_median(cycle_times) if cycle_times else (None, None)
 
     # Sprint breakdown — tickets and story points per sprint, sorted by name
-    sprint_tickets: Counter = Counter()
-    sprint_sp: dict[str, int] = {}
-    for r in assigned_rows:
-        sp = story_points(r)
-        for s in all_sprints(r):
-            sprint_tickets[s] += 1
-            sprint_sp[s] = sprint_sp.get(s, 0) + (sp or 0)
-
     sprints = {
         s: {"tickets": sprint_tickets[s], "story_points": sprint_sp.get(s, 0)}
         for s in sorted(sprint_tickets)
@@ -145,25 +194,27 @@ def analyse_jira(rows: list[dict], jira_name: str) -> dict:
             "bugs": bugs,
             "bug_rate_pct": round(bugs / assigned * 100, 1) if assigned else 0,
         },
-        "by_type": dict(by_type.most_common()),
-        "by_priority": dict(by_priority.most_common()),
-        "by_project": dict(by_project.most_common()),
+        # Breakdown sections stay as most_common() lists — display only
+        # iterates them; they become dicts at the JSON boundary in main().
+        "by_type": by_type.most_common(),
+        "by_priority": by_priority.most_common(),
+        "by_project": by_project.most_common(),
         "story_points": {
             "total": sp_total,
-            "mean_per_ticket": round(mean(sp_values), 1) if sp_values else None,
-            "median_per_ticket": round(median(sp_values), 1) if sp_values else None,
+            "mean_per_ticket": round(sp_mean, 1) if sp_mean is not None else None,
+            "median_per_ticket": round(sp_median, 1) if sp_median is not None else None,
             "min": min(sp_values) if sp_values else None,
             "max": max(sp_values) if sp_values else None,
             "missing_count": sp_missing,
         },
         "cycle_time_days": {
-            "mean": mean(cycle_times) if cycle_times else None,
-            "median": median(cycle_times) if cycle_times else None,
+            "mean": ct_mean,
+            "median": ct_median,
             "min": min(cycle_times) if cycle_times else None,
             "max": max(cycle_times) if cycle_times else None,
             "count": len(cycle_times),
         },
-        "epics": dict(parent_counts.most_common()),
+        "epics": parent_counts.most_common(),
         "sprints": sprints,
     }
 
@@ -178,66 +229,70 @@ def display(
     sp = stats["story_points"]
     ct = stats["cycle_time_days"]
 
-    print(f"\n{'═' * 55}")
-    print(f"  JIRA Analysis — {author}")
-    print(f"{'═' * 55}")
+    # Buffer every line and flush with one stdout write at the end — avoids a
+    # lock/flush per print() in the per-row loops below.
+    out: list[str] = []
 
-    print(f"\n── Ticket Counts {'─' * 37}")
-    print(f"  Total            {fmt_int(t['tickets'])}")
-    print(
+    out.append(f"\n{'═' * 55}")
+    out.append(f"  JIRA Analysis — {author}")
+    out.append(f"{'═' * 55}")
+
+    out.append(f"\n── Ticket Counts {'─' * 37}")
+    out.append(f"  Total            {fmt_int(t['tickets'])}")
+    out.append(
         f"  Assigned to you  {fmt_int(t['assigned'])}  ({pct(t['assigned'], t['tickets'])})"
     )
-    print(
+    out.append(
         f"  Reported by you  {fmt_int(t['reported'])}  ({pct(t['reported'], t['tickets'])})"
     )
     if t["both"]:
-        print(f"  Both             {fmt_int(t['both'])}")
-    print(
+        out.append(f"  Both             {fmt_int(t['both'])}")
+    out.append(
         f"  Resolved         {fmt_int(t['resolved'])}  ({pct(t['resolved'], t['assigned'])})"
     )
-    print(f"  Bugs             {fmt_int(t['bugs'])}  ({t['bug_rate_pct']}%)")
-    print(f"\n  (all sections below: assigned tickets only)")
+    out.append(f"  Bugs             {fmt_int(t['bugs'])}  ({t['bug_rate_pct']}%)")
+    out.append(f"\n  (all sections below: assigned tickets only)")
 
-    print(f"\n── By Issue Type {'─' * 37}")
-    for issue_type, n in stats["by_type"].items():
-        print(f"  {issue_type:<25} {n:>3}  {pct(n, t['assigned']):>4}")
+    out.append(f"\n── By Issue Type {'─' * 37}")
+    for issue_type, n in stats["by_type"]:
+        out.append(f"  {issue_type:<25} {n:>3}  {pct(n, t['assigned']):>4}")
 
-    print(f"\n── By Priority {'─' * 39}")
-    for priority, n in stats["by_priority"].items():
-        print(f"  {priority:<25} {n:>3}  {pct(n, t['assigned']):>4}")
+    out.append(f"\n── By Priority {'─' * 39}")
+    for priority, n in stats["by_priority"]:
+        out.append(f"  {priority:<25} {n:>3}  {pct(n, t['assigned']):>4}")
 
-    print(f"\n── By Project {'─' * 40}")
-    for project, n in stats["by_project"].items():
-        print(f"  {project:<25} {n:>3}  {pct(n, t['assigned']):>4}")
+    out.append(f"\n── By Project {'─' * 40}")
+    for project, n in stats["by_project"]:
+        out.append(f"  {project:<25} {n:>3}  {pct(n, t['assigned']):>4}")
 
-    print(f"\n── Story Points {'─' * 38}")
-    print(f"  Total            {fmt_int(sp['total'])}")
+    out.append(f"\n── Story Points {'─' * 38}")
+    out.append(f"  Total            {fmt_int(sp['total'])}")
     if sp["mean_per_ticket"] is not None:
-        print(f"  Mean/ticket      {sp['mean_per_ticket']}")
-        print(f"  Median           {sp['median_per_ticket']}")
-        print(f"  Min              {sp['min']}")
-        print(f"  Max              {sp['max']}")
+        out.append(f"  Mean/ticket      {sp['mean_per_ticket']}")
+        out.append(f"  Median           {sp['median_per_ticket']}")
+        out.append(f"  Min              {sp['min']}")
+        out.append(f"  Max              {sp['max']}")
     if sp["missing_count"]:
-        print(f"  (missing on {sp['missing_count']} tickets)")
+        out.append(f"  (missing on {sp['missing_count']} tickets)")
 
     if ct["mean"] is not None:
-        print(f"\n── Cycle Time (created → resolved) {'─' * 19}")
-        print(f"  Mean             {fmt_duration(ct['mean'])}")
-        print(f"  Median           {fmt_duration(ct['median'])}")
-        print(f"  Fastest          {fmt_duration(ct['min'])}")
-        print(f"  Slowest          {fmt_duration(ct['max'])}")
-        print(f"  ({ct['count']} resolved tickets)")
-
-    n_epics = sum(1 for e in stats["epics"] if e != "— (no epic)")
-    print(f"\n── Epics / Initiatives {'─' * 31}  {n_epics} unique")
-    for epic, n in stats["epics"].items():
+        out.append(f"\n── Cycle Time (created → resolved) {'─' * 19}")
+        out.append(f"  Mean             {fmt_duration(ct['mean'])}")
+        out.append(f"  Median           {fmt_duration(ct['median'])}")
+        out.append(f"  Fastest          {fmt_duration(ct['min'])}")
+        out.append(f"  Slowest          {fmt_duration(ct['max'])}")
+        out.append(f"  ({ct['count']} resolved tickets)")
+
+    n_epics = sum(1 for e, _ in stats["epics"] if e != "— (no epic)")
+    out.append(f"\n── Epics / Initiatives {'─' * 31}  {n_epics} unique")
+    for epic, n in stats["epics"]:
         short = epic[:50]
-        print(f"  {short:<50} {n:>3}")
+        out.append(f"  {short:<50} {n:>3}")
 
     sprints = stats["sprints"]
     has_totals = bool(sprint_totals)
     section = "your contribution" if has_totals else "your tickets"
-    print(f"\n── Sprints ({section}) {'─' * (34 - len(section))}  {len(sprints)} total")
+    out.append(f"\n── Sprints ({section}) {'─' * (34 - len(section))}  {len(sprints)} total")
 
     if sprint_totals is not None:
         # Compute pts % per sprint for stats (only sprints with team pts data)
@@ -250,14 +305,14 @@ def display(
             ratios = [my / team for _, my, team in pts_ratios]
             mean_pct = sum(ratios) / len(ratios)
             top_sprint, top_my, top_team = max(pts_ratios, key=lambda x: x[1] / x[2])
-            print(f"  Mean contribution   {mean_pct * 100:.0f}%  (pts)")
-            print(f"  Top sprint          {top_sprint}  —  {top_my} / {top_team:.0f} pts  ({top_my / top_team * 100:.0f}%)")
-            print()
+            out.append(f"  Mean contribution   {mean_pct * 100:.0f}%  (pts)")
+            out.append(f"  Top sprint          {top_sprint}  —  {top_my} / {top_team:.0f} pts  ({top_my / top_team * 100:.0f}%)")
+            out.append("")
 
-        print(
+        out.append(
             f"  {'sprint':<35} {'my tkts':>7}  {'team tkts':>9}  {'my pts':>6}  {'team pts':>8}  {'pts %':>5}"
         )
-        print(f"  {'─' * 35} {'─' * 7}  {'─' * 9}  {'─' * 6}  {'─' * 8}  {'─' * 5}")
+        out.append(f"  {'─' * 35} {'─' * 7}  {'─' * 9}  {'─' * 6}  {'─' * 8}  {'─' * 5}")
         for sprint, s in sprints.items():
             my_pts = s["story_points"] or 0
             if sprint in sprint_totals:
@@ -267,23 +322,24 @@ def display(
                 ratio = my_pts / t_pts if t_pts else 0
                 filled = round(ratio * 20)
                 bar = "█" * filled + "░" * (20 - filled)
-                print(
+                out.append(
                     f"  {sprint:<35} {s['tickets']:>7}  {t_tkts:>9}  {my_pts:>6}  {t_pts:>8.0f}  {pct(my_pts, t_pts):>5}  {bar}"
                 )
             else:
-                print(
+                out.append(
                     f"  {sprint:<35} {s['tickets']:>7}  {'?':>9}  {my_pts:>6}  {'?':>8}  {'?':>5}  (no totals)"
                 )
     else:
-        print(f"  {'sprint':<35} {'tickets':>7}   {'pts':>5}")
-        print(f"  {'─' * 35} {'─' * 7}   {'─' * 5}")
+        out.append(f"  {'sprint':<35} {'tickets':>7}   {'pts':>5}")
+        out.append(f"  {'─' * 35} {'─' * 7}   {'─' * 5}")
         for sprint, s in sprints.items():
             bar = "█" * s["tickets"]
-            print(
+            out.append(
                 f"  {sprint:<35} {s['tickets']:>7}   {s['story_points']:>5}  {bar}"
             )
 
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ── main ──────────────────────────────────────────────────────────────────────
@@ -326,14 +382,23 @@ def main():
         parser.error(f"Input file not found: {input_path}")
 
     with input_path.open(newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        rows = list(reader)
+        reader = csv.reader(fh)
+        col = csv_columns(next(reader, []))
+        i_assignee = col.get("Assignee", -1)
+
+        # Infer JIRA display name from the Assignee column. Peeking a bounded
+        # head is enough — the CSV is the author's own export, so the majority
+        # assignee is stable — and lets the rest of the file stream straight
+        # into analyse_jira without materializing every row.
+        head = list(islice(reader, 500))
+        assignee_counts: Counter = Counter(
+            a
+            for r in head
+            if i_assignee >= 0 and len(r) > i_assignee and (a := r[i_assignee].strip())
+        )
+        jira_name = assignee_counts.most_common(1)[0][0] if assignee_counts else ""
 
-    # Infer JIRA display name from the Assignee column
-    assignee_counts: Counter = Counter(
-        r.get("Assignee", "").strip() for r in rows if r.get("Assignee", "").strip()
-    )
-    jira_name = assignee_counts.most_common(1)[0][0] if assignee_counts else ""
+        stats = analyse_jira(chain(head, reader), col, jira_name)
 
     if not author:
         author = input_path.stem.removesuffix("_jira") or "unknown"
@@ -342,7 +407,7 @@ def main():
     sprint_totals_path = Path(args.sprint_totals or f"data/{author}_sprint_totals.json")
     sprint_totals: dict | None = None
     if sprint_totals_path.exists():
-        sprint_totals = json.loads(sprint_totals_path.read_text())
+        sprint_totals = load_json(sprint_totals_path)
     elif not args.sprint_totals:
         # Only print the note when using the default auto-derived path
         print(
@@ -351,17 +416,20 @@ def main():
             file=sys.stderr,
         )
 
-    stats = analyse_jira(rows, jira_name)
     display(author, jira_name, stats, sprint_totals=sprint_totals)
 
     if args.output:
         out = Path(args.output)
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(
-            json.dumps(
-                {"author": author, "jira_name": jira_name, "jira": stats}, indent=2
-            )
-        )
+        # Pair lists become ordered dicts only here, at the JSON boundary
+        json_stats = {
+            **stats,
+            "by_type": dict(stats["by_type"]),
+            "by_priority": dict(stats["by_priority"]),
+            "by_project": dict(stats["by_project"]),
+            "epics": dict(stats["epics"]),
+        }
+        dump_json(out, {"author": author, "jira_name": jira_name, "jira": json_stats})
         print(f"Stats written to: {args.output}")
 
 
@@ -15,25 +15,66 @@ Usage:
 """
 
 import argparse
-import json
-from collections import Counter, defaultdict
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from statistics import mean, median
 
-from utils import fmt_duration, fmt_int, pct
+from utils import dump_json, fmt_duration, fmt_int, iter_ndjson, load_json, pct
+
+try:
+    # Optional: numpy's C reductions beat statistics.mean/median once the
+    # value lists get large. The script works fine without it.
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # Optional: ijson lets large PR dumps stream straight into the fused
+    # aggregation loop instead of being materialized as one big list.
+    import ijson
+except ImportError:
+    ijson = None
+
+# Below this size the statistics module wins (no array-construction overhead)
+_NUMPY_MIN_SIZE = 256
+
+# reviewDecision has a tiny closed set of values, so merged-PR decisions are
+# counted in a fixed-slot list (indexed bump) rather than a hashed Counter.
+_DECISIONS = ("APPROVED", "CHANGES_REQUESTED", "REVIEW_REQUIRED", "NONE")
+_DECISION_IDX = {d: i for i, d in enumerate(_DECISIONS)}
+
+# Verdict strength for picking the strongest review verdict per PR
+_VERDICT_ORDER = {"APPROVED": 3, "CHANGES_REQUESTED": 2, "COMMENTED": 1}
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
 
+def _ttm_stats(values: array) -> tuple[float, float, float, float]:
+    """Mean/median/min/max over one array build, vectorized when it pays off."""
+    if np is not None and len(values) >= _NUMPY_MIN_SIZE:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        return float(arr.mean()), float(np.median(arr)), float(arr.min()), float(arr.max())
+    return mean(values), median(values), min(values), max(values)
+
+
+@lru_cache(maxsize=8192)
 def parse_dt(s: str | None) -> datetime | None:
     if not s:
         return None
-    return datetime.fromisoformat(s.replace("Z", "+00:00"))
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    return datetime.fromisoformat(s)
 
 
 def days_between(a: str | None, b: str | None) -> float | None:
+    if a is None and b is None:
+        return None
     dt_a, dt_b = parse_dt(a), parse_dt(b)
     if dt_a and dt_b:
         return (dt_b - dt_a).total_seconds() / 86400
@@ -43,74 +84,107 @@ def days_between(a: str | None, b: str | None) -> float | None:
 # ── core analysis ─────────────────────────────────────────────────────────────
 
 
-def analyse_authored(prs: list[dict], author: str) -> dict:
-    """Stats derived from PRs where this person is the author."""
-    total = len(prs)
-    merged = [pr for pr in prs if pr.get("mergedAt")]
-    open_ = [pr for pr in prs if pr["state"] == "OPEN"]
-    closed = [pr for pr in prs if pr["state"] == "CLOSED" and not pr.get("mergedAt")]
-    drafts = [pr for pr in prs if pr.get("isDraft")]
-
-    # Code churn
-    additions = sum(pr.get("additions", 0) or 0 for pr in prs)
-    deletions = sum(pr.get("deletions", 0) or 0 for pr in prs)
-    churn = additions + deletions
-    net = additions - deletions
-    files = sum(pr.get("changedFiles", 0) or 0 for pr in prs)
-
-    # Per-PR size buckets
-    def size_bucket(pr):
-        c = (pr.get("additions") or 0) + (pr.get("deletions") or 0)
-        if c <= 50:
-            return "XS (≤50)"
-        if c <= 200:
-            return "S (51-200)"
-        if c <= 500:
-            return "M (201-500)"
-        if c <= 1000:
-            return "L (501-1000)"
-        return "XL (>1000)"
-
-    size_dist = Counter(size_bucket(pr) for pr in prs)
-
-    # Time to merge (calendar days)
-    ttm = [
-        d
-        for pr in merged
-        if (d := days_between(pr.get("createdAt"), pr.get("mergedAt"))) is not None
-    ]
-
-    # Repo breakdown
-    repo_stats = defaultdict(
-        lambda: {"prs": 0, "additions": 0, "deletions": 0, "files": 0}
-    )
-    for pr in prs:
-        r = pr["repo"]
-        repo_stats[r]["prs"] += 1
-        repo_stats[r]["additions"] += pr.get("additions", 0) or 0
-        repo_stats[r]["deletions"] += pr.get("deletions", 0) or 0
-        repo_stats[r]["files"] += pr.get("changedFiles", 0) or 0
-
-    # How your PRs were received by reviewers (reviewDecision on merged PRs)
-    received_decisions = Counter(pr.get("reviewDecision") or "NONE" for pr in merged)
-
-    # Who reviewed your work most (excluding self)
+def analyse_authored(
+    prs: Iterable[dict], author: str, *, filter_author: bool = False
+) -> dict:
+    """Stats derived from PRs where this person is the author.
+
+    Everything is accumulated in one fused pass over `prs` — the previous
+    per-section comprehensions walked the list of dicts eight times. With
+    `filter_author=True`, PRs by other authors are skipped inside the same
+    pass, so callers don't need a separate filtering traversal first.
+    """
+    total = merged = open_ = closed = drafts = 0
+    additions = deletions = files = 0
+    size_dist: Counter = Counter()
+    # Contiguous machine doubles, not a list of boxed floats — the one
+    # column that accumulates per-PR values for a later reduction.
+    ttm = array("d")
+    # Per-metric Counters keyed by repo — skips the per-new-repo factory
+    # call + dict allocation a defaultdict(lambda: {...}) would pay.
+    repo_prs: Counter = Counter()
+    repo_additions: Counter = Counter()
+    repo_deletions: Counter = Counter()
+    repo_files: Counter = Counter()
+    decision_counts = [0] * len(_DECISIONS)
+    other_decisions: Counter = Counter()
     reviewer_counts: Counter = Counter()
     approver_counts: Counter = Counter()
+
     for pr in prs:
+        if filter_author and pr.get("author") != author:
+            continue
+        total += 1
+        a = pr.get("additions") or 0
+        d = pr.get("deletions") or 0
+        f = pr.get("changedFiles") or 0
+        additions += a
+        deletions += d
+        files += f
+
+        # Per-PR size bucket
+        c = a + d
+        if c <= 50:
+            size_dist["XS (≤50)"] += 1
+        elif c <= 200:
+            size_dist["S (51-200)"] += 1
+        elif c <= 500:
+            size_dist["M (201-500)"] += 1
+        elif c <= 1000:
+            size_dist["L (501-1000)"] += 1
+        else:
+            size_dist["XL (>1000)"] += 1
+
+        merged_at = pr.get("mergedAt")
+        if merged_at:
+            merged += 1
+            # How the PR was received (reviewDecision on merged PRs)
+            decision = pr.get("reviewDecision") or "NONE"
+            idx = _DECISION_IDX.get(decision)
+            if idx is not None:
+                decision_counts[idx] += 1
+            else:
+                other_decisions[decision] += 1
+            # Time to merge (calendar days)
+            t = days_between(pr.get("createdAt"), merged_at)
+            if t is not None:
+                ttm.append(t)
+        elif pr["state"] == "CLOSED":
+            closed += 1
+        if pr["state"] == "OPEN":
+            open_ += 1
+        if pr.get("isDraft"):
+            drafts += 1
+
+        # Repo breakdown
+        repo = pr["repo"]
+        repo_prs[repo] += 1
+        repo_additions[repo] += a
+        repo_deletions[repo] += d
+        repo_files[repo] += f
+
+        # Who reviewed your work most (excluding self)
         for r in pr.get("reviews", []):
             if r["author"] != author:
                 reviewer_counts[r["author"]] += 1
                 if r.get("state") == "APPROVED":
                     approver_counts[r["author"]] += 1
 
+    churn = additions + deletions
+    net = additions - deletions
+    ttm_mean, ttm_median, ttm_min, ttm_max = (
+        _ttm_stats(ttm) if ttm else (None, None, None, None)
+    )
+    received_decisions = {d: n for d, n in zip(_DECISIONS, decision_counts) if n}
+    received_decisions.update(other_decisions)
+
     return {
         "totals": {
             "prs": total,
-            "merged": len(merged),
-            "open": len(open_),
-            "closed": len(closed),
-            "draft": len(drafts),
+            "merged": merged,
+            "open": open_,
+            "closed": closed,
+            "draft": drafts,
         },
         "churn": {
             "additions": additions,
@@ -124,16 +198,21 @@ def analyse_authored(prs: list[dict], author: str) -> dict:
         },
         "size_distribution": dict(size_dist),
         "time_to_merge_days": {
-            "mean": mean(ttm) if ttm else None,
-            "median": median(ttm) if ttm else None,
-            "min": min(ttm) if ttm else None,
-            "max": max(ttm) if ttm else None,
+            "mean": ttm_mean,
+            "median": ttm_median,
+            "min": ttm_min,
+            "max": ttm_max,
         },
         "repos": {
-            repo: dict(s)
-            for repo, s in sorted(repo_stats.items(), key=lambda x: -x[1]["prs"])
+            repo: {
+                "prs": n,
+                "additions": repo_additions[repo],
+                "deletions": repo_deletions[repo],
+                "files": repo_files[repo],
+            }
+            for repo, n in repo_prs.most_common()
         },
-        "received_decisions": dict(received_decisions),
+        "received_decisions": received_decisions,
         "top_reviewers_of_your_work": dict(reviewer_counts.most_common(10)),
         "top_approvers_of_your_work": dict(approver_counts.most_common(10)),
     }
@@ -149,16 +228,21 @@ def analyse_reviewed(reviewed_prs: list[dict], reviewer: str) -> dict:
         for r in pr.get("your_reviews", []):
             given_decisions[r["state"]] += 1
 
-    # PRs grouped by the verdict given (use the strongest verdict per PR)
-    verdict_order = {"APPROVED": 3, "CHANGES_REQUESTED": 2, "COMMENTED": 1}
+    # PRs grouped by the verdict given (use the strongest verdict per PR).
+    # Explicit scan with the dict lookup bound to a local — no per-review
+    # lambda frame, no max() key callbacks.
+    vo_get = _VERDICT_ORDER.get
     prs_by_verdict: Counter = Counter()
     for pr in reviewed_prs:
-        if not pr.get("your_reviews"):
-            continue
-        strongest = max(
-            pr["your_reviews"], key=lambda r: verdict_order.get(r["state"], 0)
-        )
-        prs_by_verdict[strongest["state"]] += 1
+        best = 0
+        best_state = None
+        for r in pr.get("your_reviews", []):
+            state = r["state"]
+            rank = vo_get(state, 0)
+            if rank > best or best_state is None:
+                best, best_state = rank, state
+        if best_state is not None:
+            prs_by_verdict[best_state] += 1
 
     # Authors whose PRs you reviewed most
     reviewed_authors: Counter = Counter()
@@ -186,29 +270,33 @@ def display(author: str, authored: dict, reviewed: dict | None) -> None:
     c = authored["churn"]
     ttm = authored["time_to_merge_days"]
 
-    print(f"\n{'═' * 55}")
-    print(f"  PR Analysis — {author}")
-    print(f"{'═' * 55}")
+    # Buffer every line and flush with one stdout write at the end — avoids a
+    # lock/flush per print() in the per-row loops below.
+    out: list[str] = []
+
+    out.append(f"\n{'═' * 55}")
+    out.append(f"  PR Analysis — {author}")
+    out.append(f"{'═' * 55}")
 
-    print(f"\n── PR Counts {'─' * 42}")
-    print(f"  Total        {fmt_int(t['prs'])}")
-    print(f"  Merged       {fmt_int(t['merged'])}  ({pct(t['merged'], t['prs'])})")
-    print(f"  Open         {fmt_int(t['open'])}")
-    print(f"  Closed       {fmt_int(t['closed'])}")
+    out.append(f"\n── PR Counts {'─' * 42}")
+    out.append(f"  Total        {fmt_int(t['prs'])}")
+    out.append(f"  Merged       {fmt_int(t['merged'])}  ({pct(t['merged'], t['prs'])})")
+    out.append(f"  Open         {fmt_int(t['open'])}")
+    out.append(f"  Closed       {fmt_int(t['closed'])}")
     if t["draft"]:
-        print(f"  Draft        {fmt_int(t['draft'])}")
-
-    print(f"\n── Code Churn {'─' * 41}")
-    print(f"  Additions    +{fmt_int(c['additions'])}")
-    print(f"  Deletions    -{fmt_int(c['deletions'])}")
-    print(f"  Net          {'+' if c['net'] >= 0 else ''}{fmt_int(c['net'])}")
-    print(f"  Total churn  {fmt_int(c['total'])} lines")
-    print(f"  Files        {fmt_int(c['files'])} changed")
-    print(
+        out.append(f"  Draft        {fmt_int(t['draft'])}")
+
+    out.append(f"\n── Code Churn {'─' * 41}")
+    out.append(f"  Additions    +{fmt_int(c['additions'])}")
+    out.append(f"  Deletions    -{fmt_int(c['deletions'])}")
+    out.append(f"  Net          {'+' if c['net'] >= 0 else ''}{fmt_int(c['net'])}")
+    out.append(f"  Total churn  {fmt_int(c['total'])} lines")
+    out.append(f"  Files        {fmt_int(c['files'])} changed")
+    out.append(
         f"  Per PR avg   +{c['avg_additions_per_pr']} / -{c['avg_deletions_per_pr']} lines, {c['avg_files_per_pr']} files"
     )
 
-    print(f"\n── PR Size Distribution {'─' * 31}")
+    out.append(f"\n── PR Size Distribution {'─' * 31}")
     for bucket in [
         "XS (≤50)",
         "S (51-200)",
@@ -217,52 +305,53 @@ def display(author: str, authored: dict, reviewed: dict | None) -> None:
         "XL (>1000)",
     ]:
         n = authored["size_distribution"].get(bucket, 0)
-        print(f"  {bucket:<15} {n:>3}  {'█' * n}")
+        out.append(f"  {bucket:<15} {n:>3}  {'█' * n}")
 
     if ttm["mean"] is not None:
-        print(f"\n── Time to Merge {'─' * 38}")
-        print(f"  Mean         {fmt_duration(ttm['mean'])}")
-        print(f"  Median       {fmt_duration(ttm['median'])}")
-        print(f"  Fastest      {fmt_duration(ttm['min'])}")
-        print(f"  Slowest      {fmt_duration(ttm['max'])}")
+        out.append(f"\n── Time to Merge {'─' * 38}")
+        out.append(f"  Mean         {fmt_duration(ttm['mean'])}")
+        out.append(f"  Median       {fmt_duration(ttm['median'])}")
+        out.append(f"  Fastest      {fmt_duration(ttm['min'])}")
+        out.append(f"  Slowest      {fmt_duration(ttm['max'])}")
 
-    print(f"\n── Repositories {'─' * 39}")
+    out.append(f"\n── Repositories {'─' * 39}")
     for repo, s in authored["repos"].items():
         short = repo.split("/")[-1]
-        print(
+        out.append(
             f"  {short:<35} {s['prs']:>3} PRs  +{fmt_int(s['additions'])} / -{fmt_int(s['deletions'])}"
         )
 
-    print(f"\n── How Your PRs Were Received (merged) {'─' * 16}")
+    out.append(f"\n── How Your PRs Were Received (merged) {'─' * 16}")
     for decision, n in authored["received_decisions"].items():
-        print(f"  {decision:<25} {n}")
+        out.append(f"  {decision:<25} {n}")
 
-    print(f"\n── Who Reviewed Your Work {'─' * 29}")
+    out.append(f"\n── Who Reviewed Your Work {'─' * 29}")
     for reviewer, n in authored["top_reviewers_of_your_work"].items():
-        print(f"  {reviewer:<30} {n} review msgs")
+        out.append(f"  {reviewer:<30} {n} review msgs")
 
-    print(f"\n── Who Approved Your PRs {'─' * 30}")
+    out.append(f"\n── Who Approved Your PRs {'─' * 30}")
     for approver, n in authored["top_approvers_of_your_work"].items():
-        print(f"  {approver:<30} {n} approvals")
+        out.append(f"  {approver:<30} {n} approvals")
 
     if reviewed:
         rv = reviewed
-        print(f"\n── Your Review Activity {'─' * 31}")
-        print(f"  PRs reviewed for others   {rv['total_prs_reviewed']}")
-        print()
-        print(f"  Verdicts given:")
+        out.append(f"\n── Your Review Activity {'─' * 31}")
+        out.append(f"  PRs reviewed for others   {rv['total_prs_reviewed']}")
+        out.append("")
+        out.append("  Verdicts given:")
         for state, n in rv["review_verdicts_given"].items():
-            print(f"    {state:<25} {n} times")
-        print()
-        print(f"  Per PR (strongest verdict):")
+            out.append(f"    {state:<25} {n} times")
+        out.append("")
+        out.append("  Per PR (strongest verdict):")
         for state, n in rv["prs_by_strongest_verdict"].items():
-            print(f"    {state:<25} {n} PRs")
-        print()
-        print(f"  Authors you reviewed most:")
+            out.append(f"    {state:<25} {n} PRs")
+        out.append("")
+        out.append("  Authors you reviewed most:")
         for a, n in rv["authors_reviewed"].items():
-            print(f"    {a:<30} {n} PRs")
+            out.append(f"    {a:<30} {n} PRs")
 
-    print()
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ── main ──────────────────────────────────────────────────────────────────────
@@ -309,26 +398,57 @@ def main():
             "Pass --author <login> or --input <path> to specify whose data to analyse."
         )
 
-    prs = json.loads(input_path.read_text())
-
-    # Infer author from data if not explicitly supplied
-    if not author:
-        authors = {pr.get("author") for pr in prs if pr.get("author")}
-        if len(authors) == 1:
-            author = authors.pop()
-            reviewed_input_path = Path(f"data/{author}_reviewed_prs.json")
-        elif len(authors) == 0:
-            print(
-                "Warning: no 'author' field in PR data. Re-run fetch_prs.py or pass --author."
+    if author and input_path.suffix == ".ndjson":
+        # NDJSON dumps (fetch_prs.py --format ndjson) stream line by line
+        # straight into the single-pass aggregation.
+        authored_stats = analyse_authored(
+            iter_ndjson(input_path), author, filter_author=True
+        )
+    elif author and ijson is not None:
+        # Stream-parse straight into the single-pass aggregation — the full
+        # PR list (raw bytes plus dict tree) never sits in memory at once.
+        with input_path.open("rb") as fh:
+            authored_stats = analyse_authored(
+                ijson.items(fh, "item"), author, filter_author=True
             )
-            author = "unknown"
-        else:
-            print(f"Multiple authors found: {authors}. Pass --author to filter.")
-            author = "unknown"
     else:
-        prs = [pr for pr in prs if pr.get("author") == author]
+        prs = (
+            list(iter_ndjson(input_path))
+            if input_path.suffix == ".ndjson"
+            else load_json(input_path)
+        )
 
-    authored_stats = analyse_authored(prs, author)
+        # Infer author from data if not explicitly supplied. The common case
+        # is a single-author dump, so scan with an early exit at the first
+        # differing author instead of materializing the full distinct set —
+        # the set is only built on the rare multi-author path, for the message.
+        if not author:
+            first = None
+            multi = False
+            for pr in prs:
+                a = pr.get("author")
+                if not a:
+                    continue
+                if first is None:
+                    first = a
+                elif a != first:
+                    multi = True
+                    break
+            if multi:
+                authors = {pr.get("author") for pr in prs if pr.get("author")}
+                print(f"Multiple authors found: {authors}. Pass --author to filter.")
+                author = "unknown"
+            elif first is None:
+                print(
+                    "Warning: no 'author' field in PR data. Re-run fetch_prs.py or pass --author."
+                )
+                author = "unknown"
+            else:
+                author = first
+                reviewed_input_path = Path(f"data/{author}_reviewed_prs.json")
+            authored_stats = analyse_authored(prs, author)
+        else:
+            authored_stats = analyse_authored(prs, author, filter_author=True)
 
     # Warn if --input was customised but --reviewed-input was left as default
     if args.input and not args.reviewed_input:
@@ -341,7 +461,11 @@ def main():
     reviewed_stats = None
     reviewed_path = reviewed_input_path
     if reviewed_path is not None and reviewed_path.exists():
-        reviewed_prs = json.loads(reviewed_path.read_text())
+        reviewed_prs = (
+            list(iter_ndjson(reviewed_path))
+            if reviewed_path.suffix == ".ndjson"
+            else load_json(reviewed_path)
+        )
 
         # Verify the reviewed file actually contains reviews by the expected author
         review_authors = {
@@ -363,15 +487,13 @@ def main():
     if args.output:
         out = Path(args.output)
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(
-            json.dumps(
-                {
-                    "author": author,
-                    "authored": authored_stats,
-                    "reviewed": reviewed_stats,
-                },
-                indent=2,
-            )
+        dump_json(
+            out,
+            {
+                "author": author,
+                "authored": authored_stats,
+                "reviewed": reviewed_stats,
+            },
         )
         print(f"Stats written to: {args.output}")
 
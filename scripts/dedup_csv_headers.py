@@ -8,15 +8,17 @@ Usage:
     python3 dedup_csv_headers.py input.csv | mlr ...
 """
 import csv
+import shutil
 import sys
 
 path = sys.argv[1] if len(sys.argv) > 1 else None
-fh = open(path, newline="") if path else sys.stdin
+fh = open(path, "rb") if path else sys.stdin.buffer
 
-reader = csv.reader(fh)
-writer = csv.writer(sys.stdout)
-
-headers = next(reader)
+# Only the header needs the CSV machinery — the body is copied through
+# verbatim in buffered chunks, so its bytes never round-trip through the
+# Python-level parser and memory use stays constant regardless of file size.
+first = fh.readline()
+headers = next(csv.reader([first.decode()]))
 
 seen: dict[str, int] = {}
 deduped: list[str] = []
@@ -28,6 +30,7 @@ for h in headers:
         seen[h] = 1
         deduped.append(h)
 
+writer = csv.writer(sys.stdout)
 writer.writerow(deduped)
-for row in reader:
-    writer.writerow(row)
+sys.stdout.flush()
+shutil.copyfileobj(fh, sys.stdout.buffer)
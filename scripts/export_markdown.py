@@ -14,17 +14,20 @@ Usage:
 
 import argparse
 import csv
-import json
+import hashlib
 import sys
-from collections import Counter, defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import wraps
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from analyse_confluence import infer_content_type
 from analyse_prs import analyse_authored, analyse_reviewed
-from analyse_jira import analyse_jira as _analyse_jira
-from utils import fmt_duration, fmt_int, pct
+from analyse_jira import analyse_jira as _analyse_jira, csv_columns
+from utils import fmt_duration, fmt_int, load_json, pct
 
 
 # ── Markdown primitives ───────────────────────────────────────────────────────
@@ -52,20 +55,59 @@ def hr() -> str:
     return "\n---\n"
 
 
+# ── Disk cache ────────────────────────────────────────────────────────────────
+
+
+_CACHE_DIR = Path(".cache/export_markdown")
+
+
+def _disk_memoize(fn):
+    """Cache a section builder's markdown on disk.
+
+    The key covers the identity (path, mtime, size) of every Path argument
+    plus the remaining arguments, so a warm re-run — tweaking --since or the
+    output path with unchanged data files — skips the parse and aggregation
+    entirely and reads the rendered section back.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        parts = [fn.__name__]
+        for v in list(args) + [kwargs[k] for k in sorted(kwargs)]:
+            if isinstance(v, Path):
+                if v.exists():
+                    st = v.stat()
+                    parts.append(f"{v}:{st.st_mtime_ns}:{st.st_size}")
+                else:
+                    parts.append(f"{v}:missing")
+            else:
+                parts.append(str(v))
+        digest = hashlib.sha1("|".join(parts).encode()).hexdigest()
+        cache_path = _CACHE_DIR / f"{fn.__name__}-{digest}.md"
+        if cache_path.exists():
+            return cache_path.read_text()
+        result = fn(*args, **kwargs)
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(result)
+        return result
+
+    return wrapper
+
+
 # ── Section builders ──────────────────────────────────────────────────────────
 
 
+@_disk_memoize
 def section_prs(prs_path: Path, reviewed_path: Path, author: str) -> str:
     if not prs_path.exists():
         return ""
 
-    prs = json.loads(prs_path.read_text())
-    prs = [pr for pr in prs if pr.get("author") == author]
-    authored = analyse_authored(prs, author)
+    prs = load_json(prs_path)
+    authored = analyse_authored(prs, author, filter_author=True)
 
     reviewed_stats = None
     if reviewed_path and reviewed_path.exists():
-        reviewed_prs = json.loads(reviewed_path.read_text())
+        reviewed_prs = load_json(reviewed_path)
         reviewed_stats = analyse_reviewed(reviewed_prs, author)
 
     t   = authored["totals"]
@@ -149,23 +191,29 @@ def section_prs(prs_path: Path, reviewed_path: Path, author: str) -> str:
     return "\n".join(out)
 
 
+@_disk_memoize
 def section_jira(jira_path: Path, sprint_totals_path: Path, author: str) -> str:
     if not jira_path.exists():
         return ""
 
     with jira_path.open(newline="", encoding="utf-8") as fh:
-        rows = list(csv.DictReader(fh))
+        reader = csv.reader(fh)
+        col = csv_columns(next(reader, []))
+        rows = list(reader)
 
+    i_assignee = col.get("Assignee", -1)
     assignee_counts: Counter = Counter(
-        r.get("Assignee", "").strip() for r in rows if r.get("Assignee", "").strip()
+        a
+        for r in rows
+        if i_assignee >= 0 and len(r) > i_assignee and (a := r[i_assignee].strip())
     )
     jira_name = assignee_counts.most_common(1)[0][0] if assignee_counts else ""
 
     sprint_totals: dict | None = None
     if sprint_totals_path and sprint_totals_path.exists():
-        sprint_totals = json.loads(sprint_totals_path.read_text())
+        sprint_totals = load_json(sprint_totals_path)
 
-    stats = _analyse_jira(rows, jira_name)
+    stats = _analyse_jira(rows, col, jira_name)
     t  = stats["totals"]
     sp = stats["story_points"]
     ct = stats["cycle_time_days"]
@@ -189,20 +237,20 @@ def section_jira(jira_path: Path, sprint_totals_path: Path, author: str) -> str:
     out.append(h(3, "By Issue Type"))
     out.append(table(
         ["Type", "Count", "%"],
-        [[tp, n, pct(n, t["assigned"])] for tp, n in stats["by_type"].items()],
+        [[tp, n, pct(n, t["assigned"])] for tp, n in stats["by_type"]],
     ))
 
     out.append(h(3, "By Priority"))
     out.append(table(
         ["Priority", "Count", "%"],
-        [[p, n, pct(n, t["assigned"])] for p, n in stats["by_priority"].items()],
+        [[p, n, pct(n, t["assigned"])] for p, n in stats["by_priority"]],
     ))
 
     if len(stats["by_project"]) > 1:
         out.append(h(3, "By Project"))
         out.append(table(
             ["Project", "Count", "%"],
-            [[p, n, pct(n, t["assigned"])] for p, n in stats["by_project"].items()],
+            [[p, n, pct(n, t["assigned"])] for p, n in stats["by_project"]],
         ))
 
     out.append(h(3, "Story Points"))
@@ -231,7 +279,7 @@ def section_jira(jira_path: Path, sprint_totals_path: Path, author: str) -> str:
     out.append(h(3, "Epics / Initiatives"))
     epic_rows = [
         [e if e != "— (no epic)" else "*(no epic)*", n]
-        for e, n in stats["epics"].items()
+        for e, n in stats["epics"]
     ]
     out.append(table(["Epic", "Tickets"], epic_rows))
 
@@ -271,11 +319,12 @@ def section_jira(jira_path: Path, sprint_totals_path: Path, author: str) -> str:
     return "\n".join(out)
 
 
+@_disk_memoize
 def section_confluence(confluence_path: Path) -> str:
     if not confluence_path.exists():
         return ""
 
-    data = json.loads(confluence_path.read_text())
+    data = load_json(confluence_path)
     created    = data.get("created", [])
     contributed = data.get("contributed", [])
     all_pages  = created + contributed
@@ -310,22 +359,10 @@ def section_confluence(confluence_path: Path) -> str:
         ],
     ))
 
-    # By content type
-    import re
-
-    def infer_type(title: str, space: str) -> str:
-        if space.upper() == "RFC" or re.search(r"\bRFC\b", title):
-            return "RFC"
-        if re.match(r"DD\s*[-–]", title) or re.search(r"design\s+doc", title, re.IGNORECASE):
-            return "Design Doc"
-        if re.search(r"\bimplement", title, re.IGNORECASE):
-            return "Implementation"
-        if re.search(r"\bflowchart\b|\bdiagram\b", title, re.IGNORECASE):
-            return "Flowchart / Diagram"
-        return "Other"
-
+    # By content type — shared with analyse_confluence, whose regexes are
+    # compiled once at module import and cached per (title, space).
     type_counts: Counter = Counter(
-        infer_type(p.get("title", ""), p.get("space", "")) for p in all_pages
+        infer_content_type(p.get("title", ""), p.get("space", "")) for p in all_pages
     )
     out.append(h(3, "By Content Type"))
     out.append(table(
@@ -333,23 +370,24 @@ def section_confluence(confluence_path: Path) -> str:
         [[ct, n, pct(n, total)] for ct, n in type_counts.most_common()],
     ))
 
-    # Activity timeline
-    monthly: dict[str, dict[str, int]] = defaultdict(lambda: {"created": 0, "edited": 0})
+    # Activity timeline — a flat Counter keyed by (month, kind) avoids the
+    # per-month defaultdict factory and inner-dict lookups.
+    timeline: Counter = Counter()
     for p in created:
         m = p.get("created", "")[:7]
         if m:
-            monthly[m]["created"] += 1
+            timeline[(m, "c")] += 1
     for p in contributed:
         m = (p.get("last_modified") or p.get("created", ""))[:7]
         if m:
-            monthly[m]["edited"] += 1
+            timeline[(m, "e")] += 1
 
-    if monthly:
+    if timeline:
         out.append(h(3, "Activity Timeline"))
-        timeline_rows = [
-            [month, v["created"], v["edited"], v["created"] + v["edited"]]
-            for month, v in sorted(monthly.items())
-        ]
+        timeline_rows = []
+        for month in sorted({m for m, _ in timeline}):
+            n_created, n_edited = timeline[(month, "c")], timeline[(month, "e")]
+            timeline_rows.append([month, n_created, n_edited, n_created + n_edited])
         out.append(table(["Month", "Created", "Edited", "Total"], timeline_rows))
 
     # Version stats for created pages
@@ -419,12 +457,30 @@ def main():
     sections.append(f"# Annual Review — {author}\n")
     sections.append(f"*Generated: {today}*  \n*Period: {period}*\n")
 
+    # The three section builders are independent (separate input files, no
+    # shared state), so run them on a thread pool: file reads and C-level
+    # JSON parsing release the GIL and overlap. Results are consumed in
+    # order, so the document layout is unchanged.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pr_future = pool.submit(
+            section_prs,
+            prs_path      = data_dir / f"{author}_prs.json",
+            reviewed_path = data_dir / f"{author}_reviewed_prs.json",
+            author        = author,
+        )
+        jira_future = pool.submit(
+            section_jira,
+            jira_path          = data_dir / f"{author}_jira_stripped.csv",
+            sprint_totals_path = data_dir / f"{author}_sprint_totals.json",
+            author             = author,
+        )
+        conf_future = pool.submit(
+            section_confluence,
+            confluence_path = data_dir / f"{author}_confluence.json",
+        )
+
     # GitHub PRs
-    pr_section = section_prs(
-        prs_path      = data_dir / f"{author}_prs.json",
-        reviewed_path = data_dir / f"{author}_reviewed_prs.json",
-        author        = author,
-    )
+    pr_section = pr_future.result()
     if pr_section:
         sections.append(hr())
         sections.append(pr_section)
@@ -432,11 +488,7 @@ def main():
         print(f"Note: {data_dir}/{author}_prs.json not found — skipping PR section.")
 
     # JIRA
-    jira_section = section_jira(
-        jira_path          = data_dir / f"{author}_jira_stripped.csv",
-        sprint_totals_path = data_dir / f"{author}_sprint_totals.json",
-        author             = author,
-    )
+    jira_section = jira_future.result()
     if jira_section:
         sections.append(hr())
         sections.append(jira_section)
@@ -444,9 +496,7 @@ def main():
         print(f"Note: {data_dir}/{author}_jira_stripped.csv not found — skipping JIRA section.")
 
     # Confluence
-    conf_section = section_confluence(
-        confluence_path = data_dir / f"{author}_confluence.json",
-    )
+    conf_section = conf_future.result()
     if conf_section:
         sections.append(hr())
         sections.append(conf_section)
@@ -21,37 +21,74 @@ Auth (all three required — flag overrides env var):
 
 import argparse
 import base64
+import hashlib
+import http.client
 import json
 import os
+import random
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from utils import dump_json
+
+try:
+    # Optional: orjson parses response bytes directly, several times faster
+    # than stdlib json on the larger paginated payloads.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data: bytes) -> dict:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 _DEFAULT_SINCE = "2025-05-28"
 _MAX_RETRIES = 5
-_RATE_LIMIT_WAIT = 60
 _BACKOFF_BASE = 5
+_BACKOFF_CAP = 300
 _PAGE_LIMIT = 50
 
+# Response-level cache: search windows for old pages are stable between runs,
+# so a short TTL turns iterative re-runs into disk reads. Set via --cache-ttl;
+# 0 (or --no-cache) disables caching entirely.
+_CACHE_DIR = Path(".cache/confluence")
+_cache_ttl = 3600
+
+
+def _cache_path(full_url: str) -> Path:
+    digest = hashlib.blake2b(full_url.encode(), digest_size=16).hexdigest()
+    return _CACHE_DIR / f"{digest}.json"
+
+
+def _backoff(attempt: int) -> float:
+    """Capped exponential backoff with jitter.
+
+    The random component de-synchronizes concurrent clients retrying after
+    the same 429/5xx, instead of everyone hammering again on the same tick.
+    """
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt) + random.uniform(0, _BACKOFF_BASE)
+
 
 def load_dotenv(dotenv_path: Path) -> None:
     if not dotenv_path.exists():
         return
     for line in dotenv_path.read_text().splitlines():
         line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" not in line:
+        if not line or line[0] == "#" or "=" not in line:
             continue
         key, _, val = line.partition("=")
-        key = key.strip()
-        val = val.strip().strip('"').strip("'")
-        if key and key not in os.environ:
-            os.environ[key] = val
+        val = val.strip()
+        # Drop one matching pair of surrounding quotes, if any.
+        if val[:1] in ("'", '"') and val[-1:] == val[:1]:
+            val = val[1:-1]
+        if key := key.strip():
+            os.environ.setdefault(key, val)
 
 
 def build_auth_header(email: str, token: str) -> str:
@@ -59,55 +96,106 @@ def build_auth_header(email: str, token: str) -> str:
     return "Basic " + base64.b64encode(raw).decode("ascii")
 
 
-def _read_error_body(exc: urllib.error.HTTPError) -> str:
-    try:
-        return exc.read().decode("utf-8", errors="replace")
-    except Exception:
-        return "(could not read response body)"
+@lru_cache(maxsize=1)
+def _headers(auth_header: str) -> dict:
+    # The auth header never changes within a run, so the request headers dict
+    # is assembled once instead of on every paginated call.
+    return {"Authorization": auth_header, "Accept": "application/json"}
+
+
+# One persistent HTTPS connection per thread — the paginator issues one
+# request per 50 results, and keep-alive saves a full TCP + TLS handshake on
+# every one of them after the first. Thread-local storage keeps the parallel
+# page fan-out from sharing a connection across workers.
+_local = threading.local()
+
+
+def _get_connection(host: str) -> http.client.HTTPSConnection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "host", None) != host:
+        _close_connection()
+        conn = http.client.HTTPSConnection(host, timeout=30)
+        _local.conn = conn
+        _local.host = host
+    return conn
+
+
+def _close_connection() -> None:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
 
 
 def confluence_get(url: str, auth_header: str, params: dict, debug: bool = False) -> dict:
-    full_url = f"{url}?{urllib.parse.urlencode(params)}" if params else url
+    # Encode the query string exactly once per call — it is reused verbatim
+    # for the cache key, debug output and every retry attempt.
+    query = urllib.parse.urlencode(params) if params else ""
+    full_url = f"{url}?{query}" if query else url
+
+    cache_path = _cache_path(full_url) if _cache_ttl > 0 else None
+    if (
+        cache_path is not None
+        and cache_path.exists()
+        and time.time() - cache_path.stat().st_mtime < _cache_ttl
+    ):
+        if debug:
+            print(f"\n  GET {full_url} (cached)", file=sys.stderr)
+        return _loads(cache_path.read_bytes())
+
     if debug:
         print(f"\n  GET {full_url}", file=sys.stderr)
-    req = urllib.request.Request(
-        full_url,
-        headers={"Authorization": auth_header, "Accept": "application/json"},
-    )
+    # Split only the bare URL — no need to re-scan the encoded query.
+    split = urllib.parse.urlsplit(url)
+    path = f"{split.path}?{query}" if query else split.path
+    headers = _headers(auth_header)
 
     for attempt in range(1, _MAX_RETRIES + 1):
+        conn = _get_connection(split.netloc)
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-
-        except urllib.error.HTTPError as exc:
-            body = _read_error_body(exc)
-            print(f"\n  HTTP {exc.code} from {url}", file=sys.stderr)
-            print(f"  Response: {body[:500]}", file=sys.stderr)
-
-            if exc.code == 401:
-                raise RuntimeError("Authentication failed — check JIRA_EMAIL and JIRA_TOKEN") from exc
-            if exc.code == 403:
-                raise RuntimeError("Forbidden — token may lack read permissions on Confluence") from exc
-            if exc.code == 429:
-                wait = int(exc.headers.get("Retry-After", _RATE_LIMIT_WAIT))
-                print(f"  Rate limit hit — waiting {wait}s...", file=sys.stderr)
-                time.sleep(wait)
-            else:
-                wait = _BACKOFF_BASE * (2 ** attempt)
-                print(f"  Retrying in {wait}s (attempt {attempt}/{_MAX_RETRIES})...", file=sys.stderr)
-                if attempt == _MAX_RETRIES:
-                    raise RuntimeError(
-                        f"Confluence API error after {_MAX_RETRIES} retries: HTTP {exc.code}\n"
-                        f"  URL: {full_url}\n  Detail: {body[:500]}"
-                    ) from exc
-                time.sleep(wait)
-
-        except urllib.error.URLError as exc:
-            wait = _BACKOFF_BASE * (2 ** attempt)
-            print(f"\n  Network error ({exc.reason}) — retrying in {wait}s...", file=sys.stderr)
+            conn.request("GET", path, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read()  # always drain so the connection stays reusable
+        except (http.client.HTTPException, OSError) as exc:
+            # Stale keep-alive or genuine network error — drop the connection
+            # so the next attempt reconnects cleanly.
+            _close_connection()
+            wait = _backoff(attempt)
+            print(f"\n  Network error ({exc}) — retrying in {wait:.0f}s...", file=sys.stderr)
+            if attempt == _MAX_RETRIES:
+                raise RuntimeError(f"Network error after {_MAX_RETRIES} retries: {exc}") from exc
+            time.sleep(wait)
+            continue
+
+        if resp.status == 200:
+            if cache_path is not None:
+                _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_path.write_bytes(body)
+            return _loads(body)
+
+        text = body.decode("utf-8", errors="replace")
+        print(f"\n  HTTP {resp.status} from {url}", file=sys.stderr)
+        print(f"  Response: {text[:500]}", file=sys.stderr)
+
+        if resp.status == 401:
+            raise RuntimeError("Authentication failed — check JIRA_EMAIL and JIRA_TOKEN")
+        if resp.status == 403:
+            raise RuntimeError("Forbidden — token may lack read permissions on Confluence")
+        if resp.status == 429:
+            # Honor Retry-After when the server sends one; otherwise a
+            # jittered backoff beats a fixed 60s wait for transient 429s.
+            retry_after = resp.getheader("Retry-After")
+            wait = int(retry_after) if retry_after else _backoff(attempt)
+            print(f"  Rate limit hit — waiting {wait:.0f}s...", file=sys.stderr)
+            time.sleep(wait)
+        else:
+            wait = _backoff(attempt)
+            print(f"  Retrying in {wait:.0f}s (attempt {attempt}/{_MAX_RETRIES})...", file=sys.stderr)
             if attempt == _MAX_RETRIES:
-                raise RuntimeError(f"Network error after {_MAX_RETRIES} retries: {exc.reason}") from exc
+                raise RuntimeError(
+                    f"Confluence API error after {_MAX_RETRIES} retries: HTTP {resp.status}\n"
+                    f"  URL: {full_url}\n  Detail: {text[:500]}"
+                )
             time.sleep(wait)
 
     return {}
@@ -170,54 +258,101 @@ def fetch_pages(
     are older than this date. Use with ORDER BY lastModified DESC queries to avoid
     paginating through the full history.
     max_results: hard cap on total pages fetched (safety net for large result sets).
+
+    When the first response reports totalSize (and no stop_before cutoff
+    applies), the remaining page windows are known up front and are fetched
+    in parallel; otherwise pagination walks sequentially as before.
     """
     url = f"{base_url}/wiki/rest/api/content/search"
-    pages: list[dict] = []
-    start = 0
 
-    while True:
-        params = {
+    def _params(start: int) -> dict:
+        # Expand only what the output needs: history.createdDate → created,
+        # version → last_modified/version_number/author. The space key comes
+        # free from the _expandable link on unexpanded results, so expanding
+        # the whole space object would just inflate every payload.
+        return {
             "cql": cql,
             "limit": _PAGE_LIMIT,
             "start": start,
-            "expand": "space,history.createdDate,version",
+            "expand": "history.createdDate,version",
         }
-        data = confluence_get(url, auth_header, params, debug=debug)
-        results = data.get("results", [])
-
-        for r in results:
-            web_ui = r.get("_links", {}).get("webui", "")
-            version = r.get("version", {})
-            pages.append(
-                {
-                    "id": r.get("id", ""),
-                    "title": r.get("title", ""),
-                    "space": r.get("space", {}).get("key", ""),
-                    "url": f"{base_url}/wiki{web_ui}" if web_ui else "",
-                    "created": _extract_date(r),
-                    "last_modified": (version.get("when") or "")[:10],
-                    "version_number": version.get("number"),
-                    # internal field used for post-filtering; stripped before output
-                    "_version_author_id": version.get("by", {}).get("accountId", ""),
-                }
-            )
-
-        fetched = len(results)
-        start += fetched
-
-        if fetched < _PAGE_LIMIT or not data.get("_links", {}).get("next"):
-            break
-
-        if max_results and len(pages) >= max_results:
-            break
-        # Early exit: results are ordered DESC by lastModified, so once the oldest
-        # result in this batch predates our cutoff, all subsequent pages will too.
-        if stop_before and results:
-            oldest_in_batch = (
-                results[-1].get("version", {}).get("when") or ""
-            )[:10]
-            if oldest_in_batch and oldest_in_batch < stop_before:
+
+    data = confluence_get(url, auth_header, _params(0), debug=debug)
+    batch = data.get("results", [])
+    results: list[dict] = list(batch)
+    total = data.get("totalSize")
+
+    if (
+        stop_before is None
+        and isinstance(total, int)
+        and total > len(results)
+        and len(batch) == _PAGE_LIMIT
+    ):
+        # Every remaining offset is known — fan the windows out on a thread
+        # pool (latency-bound requests overlap) and merge in offset order.
+        cap = min(total, max_results) if max_results else total
+        offsets = range(_PAGE_LIMIT, cap, _PAGE_LIMIT)
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            for page_data in pool.map(
+                lambda s: confluence_get(url, auth_header, _params(s), debug=debug),
+                offsets,
+            ):
+                results.extend(page_data.get("results", []))
+    else:
+        # stop_before needs ordered batches to know when to bail, and without
+        # totalSize the number of windows is unknown — walk sequentially.
+        start = len(batch)
+        while True:
+            # The server says explicitly whether another page exists — trust
+            # _links.next when the response carries _links at all. This both
+            # catches a partial batch that still has a next page and avoids a
+            # redundant request after an exact-limit final page. The
+            # short-batch heuristic remains as fallback for responses without
+            # _links.
+            links = data.get("_links")
+            if links is not None:
+                if not links.get("next"):
+                    break
+            elif len(batch) < _PAGE_LIMIT:
+                break
+            if max_results and len(results) >= max_results:
                 break
+            # Early exit: results are ordered DESC by lastModified, so once the
+            # oldest result in this batch predates our cutoff, all subsequent
+            # pages will too.
+            if stop_before and batch:
+                oldest_in_batch = (
+                    batch[-1].get("version", {}).get("when") or ""
+                )[:10]
+                if oldest_in_batch and oldest_in_batch < stop_before:
+                    break
+            data = confluence_get(url, auth_header, _params(start), debug=debug)
+            batch = data.get("results", [])
+            results.extend(batch)
+            start += len(batch)
+
+    pages: list[dict] = []
+    for r in results:
+        web_ui = r.get("_links", {}).get("webui", "")
+        version = r.get("version", {})
+        # Space key: an expanded space object if present, else the tail of
+        # the _expandable link ("/rest/api/space/KEY").
+        space = r.get("space", {}).get("key", "") or (
+            r.get("_expandable", {}).get("space", "").rpartition("/")[2]
+        )
+        pages.append(
+            {
+                "id": r.get("id", ""),
+                "title": r.get("title", ""),
+                "space": space,
+                "url": f"{base_url}/wiki{web_ui}" if web_ui else "",
+                "created": _extract_date(r),
+                "last_modified": (version.get("when") or "")[:10],
+                "version_number": version.get("number"),
+                # internal field used for post-filtering; stripped before output
+                "_version_author_id": version.get("by", {}).get("accountId", ""),
+            }
+        )
 
     # Deduplicate by page ID (Confluence search can return the same page
     # multiple times across paginated results).
@@ -240,6 +375,8 @@ def resolve(flag_val: str | None, env_key: str, label: str) -> str:
 
 
 def main():
+    global _cache_ttl
+
     _repo_root = Path(__file__).resolve().parent.parent
     load_dotenv(_repo_root / ".env")
 
@@ -256,9 +393,14 @@ def main():
                         help=f"Only include pages touched on or after this date (default: {_DEFAULT_SINCE})")
     parser.add_argument("--output", default=None, help="Output JSON (default: data/{author}_confluence.json)")
     parser.add_argument("--force", action="store_true", help="Re-fetch even if output already exists")
+    parser.add_argument("--cache-ttl", type=int, default=_cache_ttl,
+                        help=f"Seconds a cached API response stays fresh (default: {_cache_ttl})")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the API response cache")
     parser.add_argument("--debug", action="store_true", help="Print request URLs and error bodies")
     args = parser.parse_args()
 
+    _cache_ttl = 0 if args.no_cache else args.cache_ttl
+
     author = args.author
     output_path = Path(args.output or f"data/{author}_confluence.json")
 
@@ -330,10 +472,10 @@ def main():
         p.pop("_version_author_id", None)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(
+    dump_json(
+        output_path,
         {"email": email, "since": since, "created": created, "contributed": contributed},
-        indent=2,
-    ))
+    )
     print(f"Confluence data written to: {output_path}")
 
 
@@ -14,10 +14,12 @@ Usage:
 """
 
 import argparse
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from pr_utils import START_DATE, current_user, discover_repos, fetch_prs_for_numbers, search_pr_numbers
+from utils import dump_json, dump_ndjson
 
 
 def main():
@@ -27,10 +29,12 @@ def main():
     parser.add_argument("--org",    default=None, help="Limit results to this GitHub org (e.g. my-company). Omit to include all orgs.")
     parser.add_argument("--output", default=None, help="Output path (default: data/{author}_prs.json)")
     parser.add_argument("--force",  action="store_true", help="Re-fetch even if output already exists")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json",
+                        help="Output format: one JSON array (default) or one PR per line")
     args = parser.parse_args()
 
     author = args.author or current_user()
-    output_path = Path(args.output or f"data/{author}_prs.json")
+    output_path = Path(args.output or f"data/{author}_prs.{args.format}")
 
     if output_path.exists() and not args.force:
         print(f"Cache hit: {output_path} already exists. Pass --force to re-fetch.")
@@ -42,18 +46,40 @@ def main():
     repos = discover_repos(f"author:{author}", args.since, org=args.org)
     print(f"{len(repos)} repos found: {', '.join(r.split('/')[1] for r in repos)}")
 
-    all_numbers: list[tuple[str, int]] = []
+    # Per-repo searches are independent and latency-bound, so fan them out on
+    # a thread pool; each completion prints one whole line so output doesn't
+    # interleave, and results are gathered back in repo order.
+    found: dict[str, list[tuple[str, int, str]]] = {}
+    progress = sys.stdout.isatty()  # per-repo chatter only on a terminal
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = {
+            pool.submit(search_pr_numbers, f"author:{author}+repo:{repo}", args.since): repo
+            for repo in repos
+        }
+        for future in as_completed(futures):
+            repo = futures[future]
+            numbers = future.result()
+            if progress:
+                print(f"  Searched {repo}: {len(numbers)} found")
+            found[repo] = numbers
+
+    all_numbers: list[tuple[str, int, str]] = []
     for repo in repos:
-        print(f"  Searching {repo} ...", end=" ", flush=True)
-        numbers = search_pr_numbers(f"author:{author}+repo:{repo}", args.since)
-        print(f"{len(numbers)} found")
-        all_numbers.extend(numbers)
+        all_numbers.extend(found[repo])
+    # Dedupe (order-preserving) — overlapping search pages can repeat a PR,
+    # and each duplicate would cost a full detail fetch downstream.
+    all_numbers = list(dict.fromkeys(all_numbers))
 
     print(f"\nFetching details for {len(all_numbers)} PRs...")
     prs = fetch_prs_for_numbers(all_numbers, label="fetching")
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(prs, indent=2))
+    if args.format == "ndjson":
+        # One PR per line — downstream stages can stream-iterate instead of
+        # parsing the whole dump at once.
+        dump_ndjson(output_path, prs)
+    else:
+        dump_json(output_path, prs)
 
     merged = sum(1 for pr in prs if pr["mergedAt"])
     open_  = sum(1 for pr in prs if pr["state"] == "OPEN")
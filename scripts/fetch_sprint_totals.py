@@ -26,16 +26,41 @@ Auth (all three required — flag overrides env var):
 import argparse
 import base64
 import csv
+import http.client
 import json
+import math
 import os
+import random
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
-from collections import Counter
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from utils import dump_json, load_json
+
+try:
+    # Optional: orjson parses response bytes directly, several times faster
+    # than stdlib json on large sprint payloads.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+try:
+    # Optional: numpy's C reductions beat a Python accumulation loop once
+    # sprints carry hundreds of issues. The script works fine without it.
+    import numpy as np
+except ImportError:
+    np = None
+
 
 def load_dotenv(dotenv_path: Path) -> None:
     """Load KEY=VALUE pairs from a .env file into os.environ (no-op if file absent)."""
@@ -59,8 +84,19 @@ def load_dotenv(dotenv_path: Path) -> None:
 _MAX_RETRIES = 5
 _RATE_LIMIT_WAIT = 60  # seconds — fallback when Retry-After header absent
 _BACKOFF_BASE = 5  # seconds — base for exponential back-off on 5xx
+_BACKOFF_CAP = 60  # seconds — ceiling before jitter is applied
+_NUMPY_MIN_SIZE = 256  # below this the Python loop wins (no array overhead)
 _DEFAULT_SP_FIELD = "customfield_10016"
-_SP_FIELD_NAMES = {"story points", "story point estimate", "story points estimate"}
+_SP_FIELD_NAMES = frozenset(
+    {"story points", "story point estimate", "story points estimate"}
+)
+_SPRINT_BATCH = 20  # sprints per `sprint in (...)` query — keeps JQL short and pages few
+
+# Resolved SP-field lists barely ever change, but discovering them costs a
+# full field-registry fetch plus a search probe per run. Cache the result per
+# (base_url, project, primary field) with a generous TTL.
+_FIELD_CACHE_PATH = Path("data/.jira_fields_cache.json")
+_FIELD_CACHE_TTL = 24 * 3600  # seconds
 
 
 # ── helpers ───────────────────────────────────────────────────────────────────
@@ -71,204 +107,297 @@ def build_auth_header(email: str, token: str) -> str:
     return "Basic " + base64.b64encode(raw).decode("ascii")
 
 
-def _read_error_body(exc: urllib.error.HTTPError) -> str:
-    """Safely read and decode the response body from an HTTPError."""
-    try:
-        return exc.read().decode("utf-8", errors="replace")
-    except Exception:
-        return "(could not read response body)"
+class _Limiter:
+    """Proactive request pacing seeded from JIRA's x-ratelimit headers.
 
-
-def jira_get(
-    url: str, auth_header: str, params: dict, debug: bool = False
-) -> dict | list:
-    """
-    GET a JIRA REST endpoint and return parsed JSON.
-    Retries on HTTP 429 (rate limit) and 5xx errors with back-off.
-    Raises RuntimeError on auth failures or exhausted retries.
+    Instead of reacting to HTTP 429 after wasting a round trip, dispatch is
+    spaced at interval/fillrate seconds once the server has told us its fill
+    rate. A single instance is shared across the thread pool so concurrent
+    workers collectively stay under the limit instead of each discovering it
+    via its own 429.
     """
-    full_url = f"{url}?{urllib.parse.urlencode(params)}" if params else url
-    if debug:
-        print(f"\n  GET {full_url}", file=sys.stderr)
-    req = urllib.request.Request(
-        full_url,
-        headers={"Authorization": auth_header, "Accept": "application/json"},
-    )
 
-    for attempt in range(1, _MAX_RETRIES + 1):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._min_spacing = 0.0  # unknown until the first response headers
+        self._next_allowed = 0.0
+
+    def acquire(self) -> None:
+        """Block until the next request slot opens, then claim it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self._min_spacing
+        if wait > 0:
+            time.sleep(wait)
+
+    def update_from_headers(self, resp: http.client.HTTPResponse) -> None:
+        interval = resp.getheader("x-ratelimit-interval-seconds")
+        fillrate = resp.getheader("x-ratelimit-fillrate")
+        if not interval or not fillrate:
+            return
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
+            spacing = float(interval) / float(fillrate)
+        except (ValueError, ZeroDivisionError):
+            return
+        with self._lock:
+            self._min_spacing = spacing
 
-        except urllib.error.HTTPError as exc:
-            body = _read_error_body(exc)
-            print(f"\n  HTTP {exc.code} from {url}", file=sys.stderr)
-            print(f"  Response: {body[:500]}", file=sys.stderr)
 
-            if exc.code == 401:
-                raise RuntimeError(
-                    "Authentication failed — check JIRA_EMAIL and JIRA_TOKEN"
-                ) from exc
-            if exc.code == 403:
-                raise RuntimeError(
-                    "Forbidden — token may lack read permissions on this project"
-                ) from exc
-            if exc.code == 410:
-                raise RuntimeError(
-                    f"HTTP 410 Gone — endpoint or resource no longer exists.\n"
-                    f"  URL: {full_url}\n"
-                    f"  Detail: {body[:500]}"
-                ) from exc
-            if exc.code == 429:
-                wait = int(exc.headers.get("Retry-After", _RATE_LIMIT_WAIT))
-                print(f"  Rate limit hit — waiting {wait}s...", file=sys.stderr)
-                time.sleep(wait)
-            else:
-                wait = _BACKOFF_BASE * (2**attempt)
+_limiter = _Limiter()
+
+
+class _Breaker:
+    """Shared circuit breaker that fails fast while JIRA looks degraded.
+
+    Per-request backoff alone lets every pool worker keep retrying into a
+    struggling server at once. After enough consecutive 5xx/network failures
+    across all workers the breaker opens and requests raise immediately for
+    a cooldown (5s → 30s → 120s on repeated trips), so the pool drains and
+    the server gets room to recover. Any success closes it again.
+    """
+
+    _TRIP_AFTER = 5  # consecutive failures across all workers
+    _COOLDOWNS = (5, 30, 120)  # seconds, escalating per consecutive trip
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._trips = 0
+        self._opened_until = 0.0
+
+    def check(self) -> None:
+        """Raise immediately if the breaker is currently open."""
+        with self._lock:
+            remaining = self._opened_until - time.monotonic()
+        if remaining > 0:
+            raise RuntimeError(
+                f"Circuit breaker open — JIRA appears degraded, try again in {remaining:.0f}s"
+            )
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self._TRIP_AFTER:
+                cooldown = self._COOLDOWNS[min(self._trips, len(self._COOLDOWNS) - 1)]
+                self._trips += 1
+                self._failures = 0
+                self._opened_until = time.monotonic() + cooldown
                 print(
-                    f"  Retrying in {wait}s (attempt {attempt}/{_MAX_RETRIES})...",
+                    f"\n  Circuit breaker open for {cooldown}s after repeated failures.",
                     file=sys.stderr,
                 )
-                if attempt == _MAX_RETRIES:
-                    raise RuntimeError(
-                        f"JIRA API error after {_MAX_RETRIES} retries: HTTP {exc.code}\n"
-                        f"  URL: {full_url}\n"
-                        f"  Detail: {body[:500]}"
-                    ) from exc
-                time.sleep(wait)
-
-        except urllib.error.URLError as exc:
-            wait = _BACKOFF_BASE * (2**attempt)
-            print(
-                f"\n  Network error ({exc.reason}) — retrying in {wait}s...",
-                file=sys.stderr,
-            )
-            if attempt == _MAX_RETRIES:
-                raise RuntimeError(
-                    f"Network error after {_MAX_RETRIES} retries: {exc.reason}"
-                ) from exc
-            time.sleep(wait)
 
-    return {}  # unreachable; satisfies type checker
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trips = 0
 
 
-def jira_post(url: str, auth_header: str, body: dict, debug: bool = False) -> dict:
+_breaker = _Breaker()
+
+
+# One persistent HTTPS connection per thread — N sprints × paginated POSTs
+# all hit the same JIRA host, and keep-alive amortizes the TCP + TLS handshake
+# to one per thread instead of one per request. Thread-local storage keeps
+# concurrent callers from sharing a connection.
+_local = threading.local()
+
+
+def _get_connection(host: str) -> http.client.HTTPSConnection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "host", None) != host:
+        _close_connection()
+        conn = http.client.HTTPSConnection(host, timeout=30)
+        _local.conn = conn
+        _local.host = host
+    return conn
+
+
+def _close_connection() -> None:
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def _backoff(attempt: int) -> float:
+    """Capped exponential back-off with ±50% jitter.
+
+    The jitter de-synchronises pool workers that failed at the same moment,
+    so their retries don't land on the server as another burst.
+    """
+    return min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt) * random.uniform(0.5, 1.5)
+
+
+_FATAL = {
+    401: "Authentication failed — check JIRA_EMAIL and JIRA_TOKEN",
+    403: "Forbidden — token may lack read permissions on this project",
+}
+
+
+def _request(
+    method: str,
+    url: str,
+    auth_header: str,
+    params: dict | None = None,
+    body: dict | None = None,
+    debug: bool = False,
+) -> dict | list:
     """
-    POST a JIRA REST endpoint with a JSON body and return parsed JSON.
-    Same retry/error-handling behaviour as jira_get.
+    Issue one JIRA REST request and return parsed JSON.
+    Retries on HTTP 429 (rate limit) and 5xx errors with back-off; raises
+    RuntimeError on auth failures or exhausted retries. jira_get/jira_post
+    are thin wrappers — all pacing, keep-alive and retry logic lives here.
     """
-    payload = json.dumps(body).encode("utf-8")
+    query = urllib.parse.urlencode(params) if params else ""
+    full_url = f"{url}?{query}" if query else url
+    payload = json.dumps(body).encode("utf-8") if body is not None else None
     if debug:
-        print(f"\n  POST {url}  body={json.dumps(body)[:200]}", file=sys.stderr)
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Authorization": auth_header,
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-        },
-    )
+        suffix = f"  body={payload[:200].decode()}" if payload is not None else ""
+        print(f"\n  {method} {full_url}{suffix}", file=sys.stderr)
+    split = urllib.parse.urlsplit(url)
+    path = f"{split.path}?{query}" if query else split.path
+    headers = {"Authorization": auth_header, "Accept": "application/json"}
+    if payload is not None:
+        headers["Content-Type"] = "application/json"
 
     for attempt in range(1, _MAX_RETRIES + 1):
+        _breaker.check()
+        _limiter.acquire()
+        conn = _get_connection(split.netloc)
         try:
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                return json.loads(resp.read().decode("utf-8"))
-
-        except urllib.error.HTTPError as exc:
-            body_str = _read_error_body(exc)
-            print(f"\n  HTTP {exc.code} from {url}", file=sys.stderr)
-            print(f"  Response: {body_str[:500]}", file=sys.stderr)
-
-            if exc.code == 401:
-                raise RuntimeError(
-                    "Authentication failed — check JIRA_EMAIL and JIRA_TOKEN"
-                ) from exc
-            if exc.code == 403:
-                raise RuntimeError(
-                    "Forbidden — token may lack read permissions on this project"
-                ) from exc
-            if exc.code == 410:
+            conn.request(method, path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            resp_body = resp.read()  # always drain so the connection stays reusable
+        except (http.client.HTTPException, OSError) as exc:
+            # Stale keep-alive or genuine network error — drop the connection
+            # so the next attempt reconnects cleanly.
+            _close_connection()
+            _breaker.record_failure()
+            wait = _backoff(attempt)
+            print(f"\n  Network error ({exc}) — retrying in {wait:.0f}s...", file=sys.stderr)
+            if attempt == _MAX_RETRIES:
                 raise RuntimeError(
-                    f"HTTP 410 Gone — endpoint or resource no longer exists.\n"
-                    f"  URL: {url}\n"
-                    f"  Detail: {body_str[:500]}"
+                    f"Network error after {_MAX_RETRIES} retries: {exc}"
                 ) from exc
-            if exc.code == 429:
-                wait = int(exc.headers.get("Retry-After", _RATE_LIMIT_WAIT))
-                print(f"  Rate limit hit — waiting {wait}s...", file=sys.stderr)
-                time.sleep(wait)
-            else:
-                wait = _BACKOFF_BASE * (2**attempt)
-                print(
-                    f"  Retrying in {wait}s (attempt {attempt}/{_MAX_RETRIES})...",
-                    file=sys.stderr,
-                )
-                if attempt == _MAX_RETRIES:
-                    raise RuntimeError(
-                        f"JIRA API error after {_MAX_RETRIES} retries: HTTP {exc.code}\n"
-                        f"  URL: {url}\n"
-                        f"  Detail: {body_str[:500]}"
-                    ) from exc
-                time.sleep(wait)
-
-        except urllib.error.URLError as exc:
-            wait = _BACKOFF_BASE * (2**attempt)
+            time.sleep(wait)
+            continue
+
+        if resp.status == 200:
+            _limiter.update_from_headers(resp)
+            _breaker.record_success()
+            return _loads(resp_body)
+
+        text = resp_body.decode("utf-8", errors="replace")
+        print(f"\n  HTTP {resp.status} from {url}", file=sys.stderr)
+        print(f"  Response: {text[:500]}", file=sys.stderr)
+
+        if fatal := _FATAL.get(resp.status):
+            raise RuntimeError(fatal)
+        if resp.status == 410:
+            raise RuntimeError(
+                f"HTTP 410 Gone — endpoint or resource no longer exists.\n"
+                f"  URL: {full_url}\n"
+                f"  Detail: {text[:500]}"
+            )
+        if resp.status == 429:
+            wait = int(resp.getheader("Retry-After") or _RATE_LIMIT_WAIT)
+            print(f"  Rate limit hit — waiting {wait}s...", file=sys.stderr)
+            time.sleep(wait)
+        else:
+            _breaker.record_failure()
+            wait = _backoff(attempt)
             print(
-                f"\n  Network error ({exc.reason}) — retrying in {wait}s...",
+                f"  Retrying in {wait:.0f}s (attempt {attempt}/{_MAX_RETRIES})...",
                 file=sys.stderr,
             )
             if attempt == _MAX_RETRIES:
                 raise RuntimeError(
-                    f"Network error after {_MAX_RETRIES} retries: {exc.reason}"
-                ) from exc
+                    f"JIRA API error after {_MAX_RETRIES} retries: HTTP {resp.status}\n"
+                    f"  URL: {full_url}\n"
+                    f"  Detail: {text[:500]}"
+                )
             time.sleep(wait)
 
-    return {}
+    return {}  # unreachable; satisfies type checker
 
 
-# ── CSV helpers ───────────────────────────────────────────────────────────────
+def jira_get(
+    url: str, auth_header: str, params: dict, debug: bool = False
+) -> dict | list:
+    """GET a JIRA REST endpoint and return parsed JSON (see _request)."""
+    return _request("GET", url, auth_header, params=params, debug=debug)
 
 
-def infer_project(csv_path: Path) -> str:
-    """Return the most common Project key in the CSV."""
-    with csv_path.open(newline="", encoding="utf-8") as fh:
-        rows = list(csv.DictReader(fh))
-    counts = Counter(
-        r.get("Project key", "").strip()
-        for r in rows
-        if r.get("Project key", "").strip()
-    )
-    if not counts:
-        print(f"Error: no 'Project key' values found in {csv_path}", file=sys.stderr)
-        sys.exit(1)
-    return counts.most_common(1)[0][0]
+def jira_post(url: str, auth_header: str, body: dict, debug: bool = False) -> dict:
+    """POST a JIRA REST endpoint with a JSON body (see _request)."""
+    return _request("POST", url, auth_header, body=body, debug=debug)
+
+
+# ── CSV helpers ───────────────────────────────────────────────────────────────
+
 
+def scan_csv(csv_path: Path) -> tuple[Counter, dict[str, set[str]]]:
+    """Stream the CSV once, returning project-key counts and sprints per project.
 
-def sprints_from_csv(csv_path: Path, project: str) -> list[str]:
-    """Return sorted unique sprint names from rows belonging to `project`."""
+    Replaces separate infer-project and collect-sprints passes — rows are
+    parsed a single time and never materialized as a list.
+    """
+    proj_counts: Counter = Counter()
+    sprints_by_proj: dict[str, set[str]] = defaultdict(set)
     with csv_path.open(newline="", encoding="utf-8") as fh:
-        rows = list(csv.DictReader(fh))
-    sprints: set[str] = set()
-    for r in rows:
-        if r.get("Project key", "").strip() != project:
-            continue
-        for col in ("Sprint", "Sprint_2", "Sprint_3"):
-            val = r.get(col, "").strip()
-            if val:
-                sprints.add(val)
-    return sorted(sprints)
+        reader = csv.reader(fh)
+        header = next(reader, [])
+        # Only four columns matter; resolving their indices once avoids the
+        # per-row dict build and per-field key hashing DictReader pays.
+        try:
+            pk_idx = header.index("Project key")
+        except ValueError:
+            return proj_counts, sprints_by_proj
+        sprint_idxs = [
+            header.index(col)
+            for col in ("Sprint", "Sprint_2", "Sprint_3")
+            if col in header
+        ]
+        for row in reader:
+            if pk_idx >= len(row):
+                continue
+            pk = row[pk_idx].strip()
+            if not pk:
+                continue
+            proj_counts[pk] += 1
+            sprints = sprints_by_proj[pk]
+            for idx in sprint_idxs:
+                if idx < len(row) and (val := row[idx].strip()):
+                    sprints.add(val)
+    return proj_counts, sprints_by_proj
 
 
 # ── story-point field discovery ───────────────────────────────────────────────
 
 
+def _load_field_cache() -> dict:
+    try:
+        return load_json(_FIELD_CACHE_PATH)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_field_cache(key: str, sp_fields: list[str]) -> None:
+    cache = _load_field_cache()
+    cache[key] = {"ts": time.time(), "sp_fields": sp_fields}
+    _FIELD_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(_FIELD_CACHE_PATH, cache)
+
+
 def resolve_sp_fields(
     base_url: str,
     auth_header: str,
     project: str,
     sprint: str,
     primary_field: str,
+    refresh: bool = False,
     debug: bool = False,
 ) -> list[str]:
     """
@@ -276,7 +405,17 @@ def resolve_sp_fields(
     Starts with primary_field, then adds name-matched fields from the field registry,
     then any numeric customfield_* found on real tickets in the sprint.
     Each field is tried in order per ticket; the first non-null value wins.
+
+    The resolved list is cached on disk for _FIELD_CACHE_TTL — custom field
+    IDs essentially never change, so repeat runs skip the registry fetch and
+    probe search. Pass refresh=True (--refresh-fields) to re-discover.
     """
+    cache_key = f"{base_url}|{project}|{primary_field}"
+    if not refresh:
+        cached = _load_field_cache().get(cache_key)
+        if cached and time.time() - cached.get("ts", 0) < _FIELD_CACHE_TTL:
+            return cached["sp_fields"]
+
     seen: set[str] = set()
     candidates: list[str] = []
 
@@ -287,14 +426,25 @@ def resolve_sp_fields(
 
     add(primary_field)
 
-    # Name-matched candidates from the field registry
+    # Name-matched candidates from the field registry. /field/search filters
+    # server-side, returning a handful of candidates instead of the full
+    # registry; instances without it fall back to listing every field.
     try:
-        all_fields = jira_get(
-            f"{base_url}/rest/api/3/field", auth_header, {}, debug=debug
+        found = jira_get(
+            f"{base_url}/rest/api/3/field/search",
+            auth_header,
+            {"query": "story point"},
+            debug=debug,
         )
+        if isinstance(found, dict) and "values" in found:
+            all_fields = found["values"]
+        else:
+            all_fields = jira_get(
+                f"{base_url}/rest/api/3/field", auth_header, {}, debug=debug
+            )
         if isinstance(all_fields, list):
             for field in all_fields:
-                if field.get("name", "").lower() in _SP_FIELD_NAMES:
+                if field.get("name", "").casefold() in _SP_FIELD_NAMES:
                     add(field["id"])
     except Exception:
         pass
@@ -306,7 +456,9 @@ def resolve_sp_fields(
             auth_header,
             {
                 "jql": f'project="{project}" AND sprint="{sprint}" AND status=Done',
-                "fields": ["*all"],
+                # *navigable is enough to see numeric custom fields and is a
+                # fraction of the payload *all returns for these 5 issues.
+                "fields": ["*navigable"],
                 "maxResults": 5,
             },
             debug=debug,
@@ -322,12 +474,77 @@ def resolve_sp_fields(
     except Exception:
         pass
 
+    _save_field_cache(cache_key, candidates)
     return candidates
 
 
+def resolve_sprint_field(
+    base_url: str,
+    auth_header: str,
+    refresh: bool = False,
+    debug: bool = False,
+) -> str | None:
+    """
+    Return the custom field ID that carries an issue's sprint memberships,
+    or None if it can't be found. Needed to bucket issues per sprint when
+    several sprints are fetched with a single `sprint in (...)` query.
+
+    Cached alongside the SP-field resolution; a cached "not found" is kept
+    too, so instances without the field don't re-probe every run.
+    """
+    cache_key = f"{base_url}|sprint_field"
+    if not refresh:
+        cached = _load_field_cache().get(cache_key)
+        if cached and time.time() - cached.get("ts", 0) < _FIELD_CACHE_TTL:
+            fields = cached.get("sp_fields") or []
+            return fields[0] if fields else None
+
+    field_id = None
+    try:
+        all_fields = jira_get(
+            f"{base_url}/rest/api/3/field", auth_header, {}, debug=debug
+        )
+        if isinstance(all_fields, list):
+            for field in all_fields:
+                if field.get("name", "").casefold() == "sprint":
+                    field_id = field["id"]
+                    break
+    except Exception:
+        # Leave the cache alone on a failed lookup — retry next run.
+        return None
+
+    _save_field_cache(cache_key, [field_id] if field_id else [])
+    return field_id
+
+
 # ── sprint fetch ──────────────────────────────────────────────────────────────
 
 
+def _compile_pick(sp_fields: list[str]):
+    """Specialize the per-issue SP lookup for the candidate list.
+
+    One plain dict.get when there is a single field (the common case after
+    resolution/pruning); otherwise a loop over a prebuilt tuple — no
+    generator allocation per issue either way.
+    """
+    if len(sp_fields) == 1:
+        only_field = sp_fields[0]
+
+        def pick(fields: dict):
+            return fields.get(only_field)
+    else:
+        field_keys = tuple(sp_fields)
+
+        def pick(fields: dict):
+            for k in field_keys:
+                v = fields.get(k)
+                if v is not None:
+                    return v
+            return None
+
+    return pick
+
+
 def fetch_sprint_total(
     base_url: str,
     auth_header: str,
@@ -343,12 +560,19 @@ def fetch_sprint_total(
     """
     jql = f'project="{project}" AND sprint="{sprint_name}" AND status=Done'
     total_tickets = 0
-    total_sp = 0.0
-    null_sp_count = 0
+    sp_values = array("d")  # NaN marks an issue with no story points
     next_page_token: str | None = None
 
+    active_fields = list(sp_fields)
+    pick = _compile_pick(active_fields)
+    # Only the first page of a multi-candidate list pays for hit tracking —
+    # after it, dead candidates are pruned away.
+    track_hits = len(active_fields) > 1
+
     while True:
-        body: dict = {"jql": jql, "fields": sp_fields, "maxResults": 100}
+        # 1000 per page: a typical sprint comes back in one round trip
+        # instead of N/100; the nextPageToken loop stays as the safety net.
+        body: dict = {"jql": jql, "fields": active_fields, "maxResults": 1000}
         if next_page_token:
             body["nextPageToken"] = next_page_token
 
@@ -360,13 +584,32 @@ def fetch_sprint_total(
         )
         issues = data.get("issues", [])
 
-        for issue in issues:
-            fields = issue.get("fields", {})
-            sp = next((fields[f] for f in sp_fields if fields.get(f) is not None), None)
-            if sp is not None:
-                total_sp += float(sp)
-            else:
-                null_sp_count += 1
+        if track_hits and issues:
+            track_hits = False
+            hits: Counter = Counter()
+            for issue in issues:
+                fields = issue.get("fields", {})
+                sp = None
+                for k in active_fields:
+                    v = fields.get(k)
+                    if v is not None:
+                        sp = v
+                        hits[k] += 1
+                        break
+                sp_values.append(float(sp) if sp is not None else math.nan)
+            # Runtime specialization: resolve_sp_fields returns a superset of
+            # candidates, but in practice only one holds data. Drop the ones
+            # that never produced a value so later pages request (and try)
+            # only live fields.
+            if hits:
+                live = [f for f in active_fields if hits[f]]
+                if len(live) < len(active_fields):
+                    active_fields = live
+                    pick = _compile_pick(active_fields)
+        else:
+            for issue in issues:
+                sp = pick(issue.get("fields", {}))
+                sp_values.append(float(sp) if sp is not None else math.nan)
 
         total_tickets += len(issues)
         next_page_token = data.get("nextPageToken")
@@ -374,6 +617,21 @@ def fetch_sprint_total(
         if not issues or not next_page_token:
             break
 
+    # One numeric pass at the end: nansum + NaN count in C when numpy is
+    # available and the sprint is big enough to pay for the array view.
+    if np is not None and len(sp_values) >= _NUMPY_MIN_SIZE:
+        arr = np.frombuffer(sp_values, dtype=np.float64)
+        total_sp = float(np.nansum(arr))
+        null_sp_count = int(np.isnan(arr).sum())
+    else:
+        total_sp = 0.0
+        null_sp_count = 0
+        for v in sp_values:
+            if math.isnan(v):
+                null_sp_count += 1
+            else:
+                total_sp += v
+
     return {
         "total_tickets": total_tickets,
         "total_story_points": round(total_sp, 1),
@@ -381,9 +639,101 @@ def fetch_sprint_total(
     }
 
 
+def fetch_sprint_totals_batched(
+    base_url: str,
+    auth_header: str,
+    project: str,
+    sprint_names: list[str],
+    sp_fields: list[str],
+    sprint_field: str,
+    debug: bool = False,
+) -> dict[str, dict]:
+    """
+    Fetch totals for a group of sprints with one `sprint in (...)` JQL query
+    instead of a round trip per sprint. Issues are bucketed client-side by
+    their sprint memberships (the sprint custom field), so the per-sprint
+    numbers match what the single-sprint queries would have returned. Sprints
+    with no matching issues come back as zero entries.
+    """
+    quoted = ", ".join('"' + s.replace('"', '\\"') + '"' for s in sprint_names)
+    jql = f'project="{project}" AND sprint in ({quoted}) AND status=Done'
+    results = {
+        s: {"total_tickets": 0, "total_story_points": 0.0, "_null_sp_count": 0}
+        for s in sprint_names
+    }
+    pick = _compile_pick(sp_fields)
+    fields = list(sp_fields) + [sprint_field]
+    next_page_token: str | None = None
+
+    while True:
+        body: dict = {"jql": jql, "fields": fields, "maxResults": 1000}
+        if next_page_token:
+            body["nextPageToken"] = next_page_token
+
+        data = jira_post(
+            f"{base_url}/rest/api/3/search/jql",
+            auth_header,
+            body,
+            debug=debug,
+        )
+        issues = data.get("issues", [])
+
+        for issue in issues:
+            issue_fields = issue.get("fields", {})
+            sp = pick(issue_fields)
+            # The sprint field holds every sprint the issue ever sat in —
+            # count it towards each requested one, same as the per-sprint
+            # queries would.
+            for entry in issue_fields.get(sprint_field) or ():
+                name = entry.get("name") if isinstance(entry, dict) else entry
+                bucket = results.get(name)
+                if bucket is None:
+                    continue
+                bucket["total_tickets"] += 1
+                if sp is not None:
+                    bucket["total_story_points"] += float(sp)
+                else:
+                    bucket["_null_sp_count"] += 1
+
+        next_page_token = data.get("nextPageToken")
+        if not issues or not next_page_token:
+            break
+
+    for result in results.values():
+        result["total_story_points"] = round(result["total_story_points"], 1)
+    return results
+
+
 # ── main ──────────────────────────────────────────────────────────────────────
 
 
+def _warm_connections(
+    base_url: str, auth_header: str, pool: ThreadPoolExecutor, n: int
+) -> None:
+    """Pre-establish one TLS session per pool worker before real traffic.
+
+    Connections are thread-local, so without this every worker pays its full
+    TCP+TLS handshake on its first sprint query. A cheap parallel ping lets
+    the handshakes overlap up front instead. Failures are ignored — the real
+    requests carry their own retry handling.
+    """
+
+    def ping(_: int) -> None:
+        try:
+            jira_get(f"{base_url}/rest/api/3/myself", auth_header, {})
+        except Exception:
+            pass
+
+    list(pool.map(ping, range(n)))
+
+
+def _write_results(output_path: Path, results: dict) -> None:
+    """Atomically replace the output file with the current results."""
+    tmp = output_path.with_suffix(".json.tmp")
+    dump_json(tmp, results)
+    tmp.replace(output_path)
+
+
 def resolve(flag_val: str | None, env_key: str, label: str) -> str:
     """Return flag value if set, else env var, else exit with a clear message."""
     value = flag_val or __import__("os").environ.get(env_key)
@@ -435,6 +785,17 @@ def main():
     parser.add_argument(
         "--force", action="store_true", help="Re-fetch even if output already exists"
     )
+    parser.add_argument(
+        "--refresh-fields",
+        action="store_true",
+        help="Re-discover SP fields instead of using the cached resolution",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=5,
+        help="Parallel sprint fetches (default: 5 — bounded to respect JIRA rate limits)",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -450,9 +811,39 @@ def main():
         print(f"Error: input file not found: {input_path}", file=sys.stderr)
         sys.exit(1)
 
-    # Cache check
+    # Project and sprints — one pass over the CSV covers both
+    proj_counts, sprints_by_proj = scan_csv(input_path)
+    if args.project:
+        project = args.project
+    elif proj_counts:
+        project = proj_counts.most_common(1)[0][0]
+    else:
+        print(f"Error: no 'Project key' values found in {input_path}", file=sys.stderr)
+        sys.exit(1)
+    sprints = sorted(sprints_by_proj.get(project, ()))
+
+    if not sprints:
+        print(
+            f"No sprints found for project '{project}' in {input_path}. Nothing to fetch."
+        )
+        sys.exit(0)
+
+    # Per-sprint cache: reuse prior results and only fetch sprints missing
+    # from the existing output, so a new sprint doesn't force re-fetching
+    # every old one. --force discards the lot.
+    cached: dict[str, dict] = {}
     if output_path.exists() and not args.force:
-        print(f"Cache hit: {output_path} already exists. Pass --force to re-fetch.")
+        try:
+            cached = load_json(output_path)
+        except ValueError:
+            cached = {}
+
+    to_fetch = [s for s in sprints if s not in cached]
+    if not to_fetch:
+        print(
+            f"Cache hit: all {len(sprints)} sprints already in {output_path}. "
+            f"Pass --force to re-fetch."
+        )
         sys.exit(0)
 
     # Credential resolution
@@ -461,34 +852,75 @@ def main():
     token = resolve(args.token, "JIRA_TOKEN", "token")
     auth_header = build_auth_header(email, token)
 
-    # Project and sprints
-    project = args.project or infer_project(input_path)
-    sprints = sprints_from_csv(input_path, project)
-
-    if not sprints:
-        print(
-            f"No sprints found for project '{project}' in {input_path}. Nothing to fetch."
-        )
-        sys.exit(0)
-
-    print(f"Project: {project}  |  {len(sprints)} sprints to fetch")
+    print(
+        f"Project: {project}  |  {len(to_fetch)} of {len(sprints)} sprints to fetch"
+        + (f" ({len(sprints) - len(to_fetch)} cached)" if len(to_fetch) < len(sprints) else "")
+    )
 
     # Resolve SP fields once upfront — tries primary field first, then any others with data
     sp_fields = resolve_sp_fields(
-        base_url, auth_header, project, sprints[0], args.sp_field, debug=args.debug
+        base_url, auth_header, project, sprints[0], args.sp_field,
+        refresh=args.refresh_fields or args.force, debug=args.debug,
     )
     print(f"SP fields: {', '.join(sp_fields)}")
 
-    results: dict[str, dict] = {}
-    total_null_sp = 0
+    # The sprint custom field lets a single `sprint in (...)` query cover a
+    # whole batch of sprints; without it we fall back to one query each.
+    sprint_field = resolve_sprint_field(
+        base_url, auth_header, refresh=args.refresh_fields or args.force,
+        debug=args.debug,
+    )
 
-    for i, sprint in enumerate(sprints, 1):
-        print(f"\r  [{i}/{len(sprints)}] {sprint:<40}", end="", flush=True)
-        result = fetch_sprint_total(
-            base_url, auth_header, project, sprint, sp_fields, debug=args.debug
-        )
-        total_null_sp += result.pop("_null_sp_count")
-        results[sprint] = result
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Sprint queries are independent reads, so fan them out on a bounded
+    # thread pool — wall time drops from the sum of sprint latencies to
+    # roughly the slowest few. Each worker reuses its own keep-alive
+    # connection (see _get_connection). Results are checkpointed after every
+    # completion, so a killed run loses at most the in-flight sprints.
+    total_null_sp = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        _warm_connections(base_url, auth_header, pool, args.concurrency)
+        if sprint_field:
+            futures = {
+                pool.submit(
+                    fetch_sprint_totals_batched,
+                    base_url, auth_header, project,
+                    to_fetch[i : i + _SPRINT_BATCH], sp_fields, sprint_field,
+                    debug=args.debug,
+                ): to_fetch[i : i + _SPRINT_BATCH]
+                for i in range(0, len(to_fetch), _SPRINT_BATCH)
+            }
+        else:
+            futures = {
+                pool.submit(
+                    fetch_sprint_total,
+                    base_url, auth_header, project, sprint, sp_fields,
+                    debug=args.debug,
+                ): [sprint]
+                for sprint in to_fetch
+            }
+        # Under concurrency a write+flush per completion serializes workers
+        # on the stdout lock; repaint at most every 250ms (plus the final
+        # completion so the line always ends accurate).
+        last_paint = 0.0
+        done = 0
+        for future in as_completed(futures):
+            group = futures[future]
+            result = future.result()
+            batch = result if sprint_field else {group[0]: result}
+            for sprint, totals in batch.items():
+                total_null_sp += totals.pop("_null_sp_count")
+                cached[sprint] = totals
+            done += len(group)
+            now = time.monotonic()
+            if now - last_paint >= 0.25 or done == len(to_fetch):
+                print(
+                    f"\r  [{done}/{len(to_fetch)}] {group[-1]:<40}",
+                    end="", flush=True,
+                )
+                last_paint = now
+            _write_results(output_path, {s: cached[s] for s in sprints if s in cached})
 
     print()  # newline after progress
 
@@ -498,8 +930,6 @@ def main():
             file=sys.stderr,
         )
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(results, indent=2))
     print(f"Sprint totals written to: {output_path}")
 
 
@@ -7,9 +7,21 @@ Used by:
 """
 
 import json
+import random
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    # Optional: orjson parses the large search/detail payloads a few times
+    # faster than stdlib json. Everything works without it.
+    import orjson
+except ImportError:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 START_DATE = "2025-05-28"
 BATCH_SIZE = 50  # safe page size that avoids GraphQL 502s on large repos
@@ -36,6 +48,32 @@ _RATE_LIMIT_PHRASES = ("rate limit", "secondary rate", "429")
 _MAX_RETRIES = 5
 _SECONDARY_RATE_WAIT = 60  # seconds to wait on secondary rate limit hits
 
+# Per-PR detail cache. The search API reports updated_at for free; the detail
+# fetch is the expensive call, and most merged/closed PRs never change again.
+# Entries are keyed by updatedAt, so a stale copy can never be served — any
+# change to the PR changes updatedAt and forces a refetch.
+_PR_CACHE_DIR = Path(".cache/prs")
+
+
+def _cached_pr(repo: str, number: int, updated_at: str) -> dict | None:
+    """Return the cached PR detail if it matches `updated_at`, else None."""
+    if not updated_at:
+        return None
+    path = _PR_CACHE_DIR / repo / f"{number}.json"
+    try:
+        entry = _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if entry.get("updatedAt") != updated_at:
+        return None
+    return entry.get("pr")
+
+
+def _store_pr(repo: str, number: int, updated_at: str, pr: dict) -> None:
+    path = _PR_CACHE_DIR / repo / f"{number}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"updatedAt": updated_at, "pr": pr}))
+
 
 def _wait_for_rate_limit_reset() -> None:
     """Query the API rate limit and sleep until the reset window opens."""
@@ -45,13 +83,16 @@ def _wait_for_rate_limit_reset() -> None:
             capture_output=True, text=True,
         )
         reset_ts = int(result.stdout.strip())
-        wait = max(0, reset_ts - int(time.time())) + 2  # +2s buffer
-        print(f"\n  Rate limit hit — waiting {wait}s for reset...", file=sys.stderr)
+        # +2s buffer, plus jitter so pool workers that hit the limit together
+        # don't all resume in the same instant and re-trip it.
+        wait = max(0, reset_ts - int(time.time())) + 2 + random.uniform(0, 5)
+        print(f"\n  Rate limit hit — waiting {wait:.0f}s for reset...", file=sys.stderr)
         time.sleep(wait)
     except Exception:
         # If we can't determine the reset time, fall back to a fixed wait
-        print(f"\n  Rate limit hit — waiting {_SECONDARY_RATE_WAIT}s...", file=sys.stderr)
-        time.sleep(_SECONDARY_RATE_WAIT)
+        wait = _SECONDARY_RATE_WAIT + random.uniform(0, 5)
+        print(f"\n  Rate limit hit — waiting {wait:.0f}s...", file=sys.stderr)
+        time.sleep(wait)
 
 
 def gh(*args: str) -> dict:
@@ -64,7 +105,7 @@ def gh(*args: str) -> dict:
         result = subprocess.run(["gh", *args], capture_output=True, text=True)
 
         if result.returncode == 0:
-            return json.loads(result.stdout)
+            return _loads(result.stdout)
 
         stderr = result.stderr.strip()
 
@@ -113,10 +154,11 @@ def discover_repos(query: str, since: str, org: str | None = None) -> list[str]:
     return sorted(repos)
 
 
-def search_pr_numbers(query: str, since: str) -> list[tuple[str, int]]:
+def search_pr_numbers(query: str, since: str) -> list[tuple[str, int, str]]:
     """
     Search GitHub for PRs matching `query` created on or after `since`.
-    Returns a list of (owner/repo, pr_number) tuples.
+    Returns a list of (owner/repo, pr_number, updated_at) tuples — the
+    updated_at stamp drives the per-PR detail cache.
     Handles pagination automatically.
     """
     results = []
@@ -130,19 +172,20 @@ def search_pr_numbers(query: str, since: str) -> list[tuple[str, int]]:
         for item in items:
             # repo_url like https://api.github.com/repos/owner/repo-name
             repo = item["repository_url"].removeprefix("https://api.github.com/repos/")
-            results.append((repo, item["number"]))
+            results.append((repo, item["number"], item.get("updated_at") or ""))
         if len(items) < 100:
             break
         page += 1
     return results
 
 
-def fetch_pr(repo: str, number: int) -> dict | None:
+def fetch_pr(repo: str, number: int, fields: str = PR_FIELDS) -> dict | None:
     """
     Fetch full details for a single PR and return a normalised dict.
-    Returns None if the fetch fails.
+    `fields` is the comma-separated --json field list; the default covers
+    everything the analyse scripts consume. Returns None if the fetch fails.
     """
-    pr = gh("pr", "view", str(number), "--repo", repo, "--json", PR_FIELDS)
+    pr = gh("pr", "view", str(number), "--repo", repo, "--json", fields)
     if not pr or not isinstance(pr, dict):
         return None
 
@@ -163,22 +206,124 @@ def fetch_pr(repo: str, number: int) -> dict | None:
     return pr
 
 
+# PRs per GraphQL query. Aliased pullRequest fields let one API round trip
+# replace up to this many `gh pr view` subprocesses; kept modest to stay well
+# under GraphQL node/complexity limits.
+_GRAPHQL_BATCH = 25
+
+_GRAPHQL_PR_FIELDS = (
+    "number title state isDraft createdAt mergedAt additions deletions "
+    "changedFiles reviewDecision url author { login } "
+    "reviews(first: 100) { nodes { author { login } state submittedAt } }"
+)
+
+
+def _normalise_graphql_pr(repo: str, node: dict) -> dict:
+    """Reshape a GraphQL pullRequest node to match fetch_pr's output."""
+    pr = dict(node)
+    pr["repo"] = repo
+    author = pr.get("author") or {}
+    pr["author"] = author.get("login", "")
+    review_nodes = (pr.get("reviews") or {}).get("nodes") or []
+    pr["reviews"] = [
+        {
+            "author": r["author"]["login"],
+            "state": r["state"],
+            "submittedAt": r.get("submittedAt") or "",
+        }
+        for r in review_nodes
+        if r.get("author")
+    ]
+    pr["reviewDecision"] = pr.get("reviewDecision") or ""
+    return pr
+
+
+def _fetch_prs_batch(repo: str, numbers: list[int]) -> dict[int, dict]:
+    """
+    Fetch several PRs from one repo in a single GraphQL round trip,
+    using one pullRequest alias per number. Returns {number: pr} with the
+    same normalised shape as fetch_pr; numbers missing from the response
+    are simply absent from the result.
+    """
+    owner, name = repo.split("/", 1)
+    aliases = " ".join(
+        f"pr{n}: pullRequest(number: {n}) {{ {_GRAPHQL_PR_FIELDS} }}"
+        for n in numbers
+    )
+    query = f'query {{ repository(owner: "{owner}", name: "{name}") {{ {aliases} }} }}'
+    data = gh("api", "graphql", "-f", f"query={query}")
+    repo_data = (data.get("data") or {}).get("repository") or {}
+    return {
+        n: _normalise_graphql_pr(repo, node)
+        for n in numbers
+        if (node := repo_data.get(f"pr{n}"))
+    }
+
+
 def fetch_prs_for_numbers(
-    numbers: list[tuple[str, int]],
+    numbers: list[tuple[str, int, str]] | list[tuple[str, int]],
     label: str = "",
 ) -> list[dict]:
     """
-    Fetch full PR details for a list of (repo, number) pairs.
+    Fetch full PR details for a list of (repo, number, updated_at) tuples
+    (bare (repo, number) pairs also work — they just bypass the cache).
+    Unchanged PRs are served from the on-disk cache instead of refetched.
     Prints a progress indicator. Returns sorted list by createdAt.
+
+    Cache misses are grouped per repo and fetched in aliased GraphQL
+    batches — one API call covers up to _GRAPHQL_BATCH PRs instead of one
+    gh subprocess each — with batches running in parallel on a thread
+    pool. Any PR missing from a batch response falls back to a per-PR
+    fetch so one bad alias can't drop the rest.
     """
     results: dict[tuple[str, int], dict] = {}
     total = len(numbers)
-    for i, (repo, number) in enumerate(numbers, 1):
-        if label:
-            print(f"\r  {label} {i}/{total}", end="", flush=True)
-        pr = fetch_pr(repo, number)
-        if pr:
+    done = 0
+    # The \r counter only makes sense (and only pays its per-call flush
+    # syscall) on an interactive terminal — skip it when piped/redirected.
+    show_progress = bool(label) and sys.stdout.isatty()
+
+    def paint() -> None:
+        if show_progress:
+            print(f"\r  {label} {done}/{total}", end="", flush=True)
+
+    # Serve the cache first; group the misses per repo for batching.
+    misses: dict[str, list[tuple[int, str]]] = {}
+    for item in numbers:
+        repo, number, updated_at = item if len(item) == 3 else (*item, "")
+        pr = _cached_pr(repo, number, updated_at)
+        if pr is not None:
             results[(repo, number)] = pr
-    if label:
+            done += 1
+        else:
+            misses.setdefault(repo, []).append((number, updated_at))
+    paint()
+
+    def fetch_batch(repo: str, group: list[tuple[int, str]]) -> list[tuple]:
+        try:
+            batch = _fetch_prs_batch(repo, [n for n, _ in group])
+        except Exception:
+            batch = {}
+        out = []
+        for number, updated_at in group:
+            pr = batch.get(number) or fetch_pr(repo, number)
+            if pr and updated_at:
+                _store_pr(repo, number, updated_at, pr)
+            out.append((repo, number, pr))
+        return out
+
+    batches = [
+        (repo, group[i : i + _GRAPHQL_BATCH])
+        for repo, group in misses.items()
+        for i in range(0, len(group), _GRAPHQL_BATCH)
+    ]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for fetched in pool.map(lambda b: fetch_batch(*b), batches):
+            for repo, number, pr in fetched:
+                done += 1
+                if pr:
+                    results[(repo, number)] = pr
+            paint()
+    if show_progress:
         print()
     return sorted(results.values(), key=lambda p: p["createdAt"])
@@ -1,7 +1,65 @@
 """
-Shared formatting utilities used across analyse_*.py scripts.
+Shared formatting and JSON I/O utilities used across analyse_*.py scripts.
 """
 
+import json
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    # Optional: orjson parses bytes directly and is several times faster than
+    # stdlib json on large dumps. The scripts work fine without it.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path: Path):
+    """Parse a JSON file, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    # json.loads accepts bytes and does the UTF-8 decode in C — skipping the
+    # intermediate str that read_text() would build just to throw away.
+    return json.loads(path.read_bytes())
+
+
+def dump_json(path: Path, obj) -> None:
+    """Write `obj` as indented JSON, via orjson when available."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        # json.dump streams straight to the file — no full serialized string
+        # (and its UTF-8 re-encode) held in memory first.
+        with path.open("w", encoding="utf-8") as fp:
+            json.dump(obj, fp, indent=2)
+
+
+def dump_ndjson(path: Path, records) -> None:
+    """Write `records` as NDJSON — one JSON object per line.
+
+    Lets downstream consumers stream-iterate (see iter_ndjson) instead of
+    parsing one large array, keeping memory constant on big dumps.
+    """
+    if orjson is not None:
+        with path.open("wb") as fp:
+            for rec in records:
+                fp.write(orjson.dumps(rec))
+                fp.write(b"\n")
+    else:
+        with path.open("w", encoding="utf-8") as fp:
+            for rec in records:
+                json.dump(rec, fp)
+                fp.write("\n")
+
+
+def iter_ndjson(path: Path):
+    """Yield records from an NDJSON file one line at a time."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with path.open("rb") as fh:
+        for line in fh:
+            if line.strip():
+                yield loads(line)
+
 
 def fmt_duration(days: float) -> str:
     """Format a duration: use minutes when under a day, days otherwise."""
@@ -18,7 +76,12 @@ def pct(n: int | float, total: int | float) -> str:
     return f"{n / total * 100:.0f}%" if total else "0%"
 
 
+@lru_cache(maxsize=None)
+def _bar_strings(width: int) -> tuple[str, ...]:
+    """Every fill state for `width`, built once — bar() just indexes in."""
+    return tuple("█" * filled + "░" * (width - filled) for filled in range(width + 1))
+
+
 def bar(ratio: float, width: int = 20) -> str:
     """Block bar scaled to `width` chars representing 100%."""
-    filled = round(min(ratio, 1.0) * width)
-    return "█" * filled + "░" * (width - filled)
+    return _bar_strings(width)[round(min(ratio, 1.0) * width)]